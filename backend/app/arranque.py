@@ -0,0 +1,219 @@
+"""
+MÓDULO: arranque.py
+DESCRIPCIÓN: Secuencia de arranque de la aplicación y estado de disponibilidad
+RESPONSABILIDADES:
+- Preparar el esquema (DDL completo o solo verificación de versión)
+- Precalentar conexiones del pool
+- Calentar cachés en segundo plano
+- Compactar periódicamente el log de cambios
+- Informar si la aplicación está lista para recibir tráfico
+"""
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import configure_mappers
+from sqlalchemy.pool import NullPool, QueuePool
+from dotenv import load_dotenv
+import os
+import threading
+import time
+from app.database import engine, Base, SessionLocal, DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW
+from app.models import Rutina, VersionEsquema, ESQUEMA_VERSION
+from app.cambios import compactar_cambios
+
+# Cargar variables de entorno
+load_dotenv()
+
+# Modo de arranque rápido (para autoscaling):
+# - No ejecuta DDL, solo compara la versión del esquema
+# - Si la versión no coincide, vuelve al arranque completo
+ARRANQUE_RAPIDO = os.getenv("ARRANQUE_RAPIDO", "false").lower() == "true"
+
+# Conexiones del pool que se abren antes de recibir tráfico (máximo DB_POOL_SIZE)
+DB_POOL_PRECALENTAR = int(os.getenv("DB_POOL_PRECALENTAR", 0))
+
+# Segundos que /readyz espera para conectarse a la base de datos
+READYZ_TIMEOUT_S = int(os.getenv("READYZ_TIMEOUT_S", 2))
+
+# Cada cuántos minutos se purgan las lápidas vencidas del log de cambios
+# (la primera vez al iniciar; 0 = solo al iniciar)
+CAMBIOS_COMPACTAR_CADA_MINUTOS = int(os.getenv("CAMBIOS_COMPACTAR_CADA_MINUTOS", 60))
+
+# Engine sin pool para /readyz: cada verificación abre y cierra su propia
+# conexión, con un límite de tiempo corto para conectarse
+engine_verificacion = create_engine(
+    DATABASE_URL,
+    poolclass=NullPool,
+    connect_args={} if DATABASE_URL.startswith("sqlite") else {"connect_timeout": READYZ_TIMEOUT_S}
+)
+
+# Estado del arranque, consultado por /readyz
+estado = {
+    "iniciado": False,
+    "modo": "rapido" if ARRANQUE_RAPIDO else "completo",
+    "duracion_arranque": None,
+    "caches_calientes": False
+}
+
+
+def crear_esquema():
+    """
+    Arranque completo: crea las tablas e índices que falten y registra la versión
+
+    NOTA: create_all no agrega índices a tablas que ya existen, por eso se
+    recorren los índices de cada tabla por separado.
+    """
+    Base.metadata.create_all(bind=engine)
+    for tabla in Base.metadata.sorted_tables:
+        for indice in tabla.indexes:
+            indice.create(bind=engine, checkfirst=True)
+    db = SessionLocal()
+    try:
+        db.query(VersionEsquema).delete()
+        db.add(VersionEsquema(version=ESQUEMA_VERSION))
+        db.commit()
+    finally:
+        db.close()
+    print("✓ Tablas de base de datos creadas exitosamente")
+
+
+def verificar_version_esquema() -> bool:
+    """
+    Arranque rápido: una sola consulta en lugar de inspeccionar el esquema
+
+    RETORNA:
+    - True si la versión guardada coincide con ESQUEMA_VERSION
+    - False si no coincide o la tabla no existe
+    """
+    db = SessionLocal()
+    try:
+        version = db.query(VersionEsquema.version).scalar()
+    except SQLAlchemyError:
+        version = None
+    finally:
+        db.close()
+    return version == ESQUEMA_VERSION
+
+
+def precalentar_pool(cantidad: int = DB_POOL_PRECALENTAR):
+    """
+    Abre "cantidad" conexiones y las devuelve al pool
+
+    Así los primeros requests no pagan el costo de conectarse.
+    Las conexiones se abren todas juntas para que sean distintas.
+
+    NOTA: Como máximo DB_POOL_SIZE: las conexiones de overflow se cierran
+    al devolverlas, así que abrir más no deja nada precalentado.
+    """
+    cantidad = min(cantidad, DB_POOL_SIZE)
+    conexiones = []
+    try:
+        for _ in range(cantidad):
+            conexiones.append(engine.connect())
+    finally:
+        for conexion in conexiones:
+            conexion.close()
+    if cantidad:
+        print(f"✓ Pool precalentado con {len(conexiones)} conexiones")
+
+
+def calentar_caches():
+    """
+    Tareas de calentamiento que no bloquean el arranque
+
+    - Configura los mappers del ORM
+    - Ejecuta una vez la consulta principal para llenar la caché de
+      sentencias compiladas de SQLAlchemy
+    """
+    db = SessionLocal()
+    try:
+        configure_mappers()
+        db.query(Rutina).order_by(Rutina.fecha_creacion.asc()).limit(1).all()
+        estado["caches_calientes"] = True
+    except SQLAlchemyError as e:
+        print(f"✗ Error al calentar cachés: {e}")
+    finally:
+        db.close()
+
+
+def compactar_periodicamente():
+    """
+    Purga las lápidas vencidas del log de cambios al iniciar y después cada
+    CAMBIOS_COMPACTAR_CADA_MINUTOS (se ejecuta en un hilo en segundo plano)
+
+    NOTA: Un proceso que corre semanas sin reiniciarse también tiene que
+    purgar; si no, el log de cambios crece sin límite.
+    """
+    while True:
+        db = SessionLocal()
+        try:
+            purgadas = compactar_cambios(db)
+            print(f"✓ Log de cambios compactado ({purgadas} entradas purgadas)")
+        except SQLAlchemyError as e:
+            print(f"✗ Error al compactar el log de cambios: {e}")
+        finally:
+            db.close()
+        if CAMBIOS_COMPACTAR_CADA_MINUTOS <= 0:
+            return
+        time.sleep(CAMBIOS_COMPACTAR_CADA_MINUTOS * 60)
+
+
+def iniciar():
+    """
+    Ejecuta la secuencia de arranque completa
+
+    LÓGICA:
+    1. Modo rápido: verificar versión; si no coincide, crear esquema
+       Modo completo: crear esquema
+    2. Precalentar el pool
+    3. Calentar cachés y compactar el log de cambios en hilos en segundo plano
+    4. Marcar la aplicación como iniciada
+    """
+    inicio = time.perf_counter()
+
+    if ARRANQUE_RAPIDO and verificar_version_esquema():
+        print("✓ Versión del esquema verificada (arranque rápido)")
+    else:
+        crear_esquema()
+
+    precalentar_pool()
+    threading.Thread(target=calentar_caches, daemon=True).start()
+    threading.Thread(target=compactar_periodicamente, daemon=True).start()
+
+    estado["duracion_arranque"] = round(time.perf_counter() - inicio, 4)
+    estado["iniciado"] = True
+
+
+def pool_saturado() -> bool:
+    """True si todas las conexiones del pool (DB_POOL_SIZE + DB_MAX_OVERFLOW) están en uso"""
+    if not isinstance(engine.pool, QueuePool):
+        return False
+    return engine.pool.checkedout() >= engine.pool.size() + DB_MAX_OVERFLOW
+
+
+def verificar_disponibilidad() -> dict:
+    """
+    Verifica si la aplicación puede atender requests
+
+    RETORNA:
+    - Diccionario con "listo" (bool), estado de la BD y del pool
+
+    NOTA: El SELECT 1 usa una conexión propia, fuera del pool: con el pool
+    lleno, pedirle una conexión esperaría pool_timeout (30 s) antes de
+    responder. Que el pool esté lleno se informa aparte (pool_saturado).
+    """
+    try:
+        with engine_verificacion.connect() as conexion:
+            conexion.execute(text("SELECT 1"))
+        base_datos = "ok"
+    except SQLAlchemyError as e:
+        base_datos = f"error: {e.__class__.__name__}"
+    saturado = pool_saturado()
+
+    return {
+        "listo": estado["iniciado"] and base_datos == "ok" and not saturado,
+        "base_datos": base_datos,
+        "pool": engine.pool.status(),
+        "pool_saturado": saturado,
+        **estado
+    }
@@ -0,0 +1,130 @@
+"""
+MÓDULO: calendario.py
+DESCRIPCIÓN: Expansión de la plantilla semanal de una rutina a un calendario
+RESPONSABILIDADES:
+- Convertir los ejercicios de una rutina en una plantilla por día de la semana
+- Generar las sesiones (una por fecha) de forma perezosa, día por día
+- Serializar las sesiones como NDJSON o iCalendar, también de a una
+
+MEMORIA:
+Todo son generadores: solo se guarda la plantilla (una semana) y la sesión
+que se está escribiendo, sin importar cuántas semanas abarque el pedido.
+"""
+
+from datetime import date, datetime, timedelta
+import json
+from app.models import DiaSemanEnum
+
+# Índice de date.weekday() para cada día (lunes = 0)
+INDICE_DIA = {dia: indice for indice, dia in enumerate(DiaSemanEnum)}
+
+# Largo máximo de una línea de iCalendar (RFC 5545), en bytes
+LARGO_LINEA_ICS = 75
+
+
+def crear_plantilla(rutina) -> dict:
+    """
+    Agrupa los ejercicios de la rutina por día de la semana
+
+    RETORNA:
+    - Diccionario índice de día (0-6) -> lista de ejercicios ordenados por "orden"
+      (solo contiene los días que tienen ejercicios)
+    """
+    plantilla = {}
+    for ejercicio in sorted(rutina.ejercicios, key=lambda e: (e.orden, e.id)):
+        plantilla.setdefault(INDICE_DIA[DiaSemanEnum(ejercicio.dia_semana)], []).append({
+            "nombre": ejercicio.nombre,
+            "series": ejercicio.series,
+            "repeticiones": ejercicio.repeticiones,
+            "peso": ejercicio.peso,
+            "notas": ejercicio.notas,
+            "orden": ejercicio.orden
+        })
+    return plantilla
+
+
+def expandir_sesiones(plantilla: dict, desde: date, hasta: date):
+    """
+    Genera una sesión por cada fecha del rango [desde, hasta) con ejercicios
+
+    Se calcula cada fecha al momento de pedirla: no se arma la lista
+    completa, y empezar en una fecha lejana no recorre las anteriores.
+
+    GENERA:
+    - {"fecha", "dia_semana", "semana", "ejercicios"}
+      "semana" cuenta desde 1 a partir de "desde"
+    """
+    dias = list(DiaSemanEnum)
+    fecha = desde
+    while fecha < hasta:
+        ejercicios = plantilla.get(fecha.weekday())
+        if ejercicios:
+            yield {
+                "fecha": fecha.isoformat(),
+                "dia_semana": dias[fecha.weekday()].value,
+                "semana": (fecha - desde).days // 7 + 1,
+                "ejercicios": ejercicios
+            }
+        fecha += timedelta(days=1)
+
+
+def a_ndjson(sesiones):
+    """Una línea JSON por sesión"""
+    for sesion in sesiones:
+        yield json.dumps(sesion, ensure_ascii=False) + "\n"
+
+
+def _escapar_ics(texto: str) -> str:
+    """Escapa los caracteres especiales de un valor de texto de iCalendar"""
+    return (
+        texto.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def _linea_ics(linea: str) -> str:
+    """
+    Corta la línea en tramos de LARGO_LINEA_ICS bytes (RFC 5545, sección 3.1)
+    Los tramos siguientes empiezan con un espacio. No corta caracteres UTF-8.
+    """
+    tramos = []
+    actual = ""
+    for caracter in linea:
+        limite = LARGO_LINEA_ICS if not tramos else LARGO_LINEA_ICS - 1
+        if len((actual + caracter).encode("utf-8")) > limite:
+            tramos.append(actual)
+            actual = ""
+        actual += caracter
+    tramos.append(actual)
+    return "\r\n ".join(tramos) + "\r\n"
+
+
+def a_icalendar(rutina_id: int, nombre_rutina: str, sesiones):
+    """
+    Calendario iCalendar (RFC 5545) con un evento de día completo por sesión
+    """
+    sello = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    yield _linea_ics("BEGIN:VCALENDAR")
+    yield _linea_ics("VERSION:2.0")
+    yield _linea_ics("PRODID:-//Gestor de Rutinas de Gimnasio//ES")
+    yield _linea_ics(f"X-WR-CALNAME:{_escapar_ics(nombre_rutina)}")
+
+    for sesion in sesiones:
+        fecha = date.fromisoformat(sesion["fecha"])
+        detalle = "\n".join(
+            f"{e['nombre']}: {e['series']}x{e['repeticiones']}"
+            + (f" @ {e['peso']} kg" if e["peso"] else "")
+            for e in sesion["ejercicios"]
+        )
+        yield _linea_ics("BEGIN:VEVENT")
+        yield _linea_ics(f"UID:rutina-{rutina_id}-{fecha.strftime('%Y%m%d')}@gym-rutinas")
+        yield _linea_ics(f"DTSTAMP:{sello}")
+        yield _linea_ics(f"DTSTART;VALUE=DATE:{fecha.strftime('%Y%m%d')}")
+        yield _linea_ics(f"DTEND;VALUE=DATE:{(fecha + timedelta(days=1)).strftime('%Y%m%d')}")
+        yield _linea_ics(f"SUMMARY:{_escapar_ics(nombre_rutina)} - {sesion['dia_semana']}")
+        yield _linea_ics(f"DESCRIPTION:{_escapar_ics(detalle)}")
+        yield _linea_ics("END:VEVENT")
+
+    yield _linea_ics("END:VCALENDAR")
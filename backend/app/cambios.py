@@ -0,0 +1,174 @@
+"""
+MÓDULO: cambios.py
+DESCRIPCIÓN: Log de cambios de rutinas para sincronización incremental
+RESPONSABILIDADES:
+- Registrar cada creación, actualización y eliminación de rutinas
+- Calcular los cambios ocurridos desde un cursor dado
+- Compactar entradas viejas para que el log no crezca sin límite
+"""
+
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, text
+from dotenv import load_dotenv
+import os
+from app.models import Rutina, CambioRutina, OperacionCambioEnum
+
+# Cargar variables de entorno
+load_dotenv()
+
+# Días que se conservan las lápidas ("eliminar") antes de purgarlas
+# Un cliente que no sincroniza hace más tiempo recibe la lista completa
+CAMBIOS_RETENCION_DIAS = int(os.getenv("CAMBIOS_RETENCION_DIAS", 30))
+
+
+def _serializar_escritores(db: Session):
+    """
+    Toma un lock sobre el log hasta el fin de la transacción (solo PostgreSQL)
+
+    POR QUÉ:
+    El ID (cursor) sale de una secuencia al hacer flush, no al hacer commit.
+    Si T1 obtiene el 10 y T2 el 11, y T2 confirma primero, un cliente puede
+    avanzar su cursor a 11 y no ver nunca el 10. Con el lock, cada
+    escritor obtiene su ID y confirma antes de que el siguiente obtenga el
+    suyo, así los IDs quedan en orden de commit.
+
+    EXCLUSIVE no bloquea las lecturas (SELECT), solo otras escrituras.
+    SQLite ya serializa las escrituras con el lock de la base.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("LOCK TABLE cambios_rutinas IN EXCLUSIVE MODE"))
+
+
+def registrar_cambio(db: Session, rutina_id: int, operacion: OperacionCambioEnum):
+    """
+    Agrega una entrada al log dentro de la transacción actual
+
+    CÓMO FUNCIONA:
+    - Borra las entradas anteriores de la misma rutina (solo importa la última)
+    - Agrega la nueva entrada con un cursor mayor a todos los existentes
+    - NO hace commit: el endpoint que llama confirma todo junto
+
+    PARÁMETROS:
+    - db: Sesión de base de datos del request
+    - rutina_id: ID de la rutina afectada (ya asignado, hacer flush antes)
+    - operacion: Tipo de cambio realizado
+    """
+    _serializar_escritores(db)
+    db.query(CambioRutina).filter(
+        CambioRutina.rutina_id == rutina_id
+    ).delete(synchronize_session=False)
+    db.add(CambioRutina(rutina_id=rutina_id, operacion=operacion))
+
+
+def registrar_cambios(db: Session, rutina_ids: list, operacion: OperacionCambioEnum):
+    """
+    Versión masiva de registrar_cambio para operaciones sobre muchas rutinas
+    Usa un solo DELETE y un solo INSERT en lugar de dos sentencias por rutina.
+    """
+    if not rutina_ids:
+        return
+    _serializar_escritores(db)
+    db.query(CambioRutina).filter(
+        CambioRutina.rutina_id.in_(rutina_ids)
+    ).delete(synchronize_session=False)
+    db.execute(
+        insert(CambioRutina),
+        [{"rutina_id": rutina_id, "operacion": operacion} for rutina_id in rutina_ids]
+    )
+
+
+def cursor_actual(db: Session) -> int:
+    """Retorna el cursor más reciente del log (0 si está vacío)"""
+    return db.query(func.max(CambioRutina.id)).scalar() or 0
+
+
+def _limite_retencion(retencion_dias: int = CAMBIOS_RETENCION_DIAS) -> datetime:
+    """Fecha a partir de la cual una lápida se considera vieja"""
+    return datetime.utcnow() - timedelta(days=retencion_dias)
+
+
+def horizonte(db: Session) -> int:
+    """
+    Retorna el cursor más viejo a partir del cual el log está completo
+
+    Es el cursor de la lápida vencida más reciente: compactar_cambios la
+    conserva como marca y solo purga las anteriores. Un cliente con un
+    cursor menor pudo haberse perdido eliminaciones, así que debe recibir
+    la lista completa en lugar de un delta.
+    """
+    return db.query(func.max(CambioRutina.id)).filter(
+        CambioRutina.operacion == OperacionCambioEnum.ELIMINAR,
+        CambioRutina.fecha < _limite_retencion()
+    ).scalar() or 0
+
+
+def obtener_cambios(db: Session, desde: int) -> dict:
+    """
+    Calcula los cambios ocurridos después del cursor "desde"
+
+    RETORNA:
+    - Diccionario con:
+      * cursor: Cursor a usar en la próxima consulta
+      * completo: True si se devuelve la lista completa (sin cursor, muy
+        viejo o desconocido)
+      * rutinas: Rutinas creadas o actualizadas (con ejercicios)
+      * eliminadas: IDs de rutinas eliminadas
+    """
+    # Sin cursor (primera carga), cursor anterior a la compactación o
+    # posterior al último (por ejemplo, la base se recreó): lista completa
+    actual = cursor_actual(db)
+    if desde <= 0 or desde < horizonte(db) or desde > actual:
+        rutinas = db.query(Rutina).order_by(Rutina.fecha_creacion.asc()).all()
+        return {
+            "cursor": actual,
+            "completo": True,
+            "rutinas": rutinas,
+            "eliminadas": []
+        }
+
+    entradas = db.query(CambioRutina).filter(
+        CambioRutina.id > desde
+    ).order_by(CambioRutina.id.asc()).all()
+
+    modificadas = [
+        e.rutina_id for e in entradas
+        if e.operacion != OperacionCambioEnum.ELIMINAR
+    ]
+    eliminadas = [
+        e.rutina_id for e in entradas
+        if e.operacion == OperacionCambioEnum.ELIMINAR
+    ]
+
+    rutinas = []
+    if modificadas:
+        rutinas = db.query(Rutina).filter(
+            Rutina.id.in_(modificadas)
+        ).order_by(Rutina.fecha_creacion.asc()).all()
+
+    return {
+        "cursor": entradas[-1].id if entradas else desde,
+        "completo": False,
+        "rutinas": rutinas,
+        "eliminadas": eliminadas
+    }
+
+
+def compactar_cambios(db: Session) -> int:
+    """
+    Purga las lápidas más viejas que el período de retención
+
+    Las entradas de creación/actualización ya se compactan al registrar
+    (una por rutina), por eso aquí solo quedan las eliminaciones.
+    La lápida vencida más reciente se conserva: marca el horizonte.
+
+    RETORNA:
+    - Cantidad de entradas eliminadas
+    """
+    marca = horizonte(db)
+    eliminadas = db.query(CambioRutina).filter(
+        CambioRutina.operacion == OperacionCambioEnum.ELIMINAR,
+        CambioRutina.id < marca
+    ).delete(synchronize_session=False)
+    db.commit()
+    return eliminadas
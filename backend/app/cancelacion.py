@@ -0,0 +1,240 @@
+"""
+MÓDULO: cancelacion.py
+DESCRIPCIÓN: Límite de tiempo por endpoint y cancelación de consultas abandonadas
+RESPONSABILIDADES:
+- Aplicar un statement timeout distinto a cada endpoint
+- Detectar cuando el cliente se desconecta y cancelar la consulta en curso
+- Contar el trabajo cancelado (por timeout o por desconexión)
+
+CÓMO SE CANCELA SEGÚN LA BASE DE DATOS:
+- PostgreSQL: SET LOCAL statement_timeout y connection.cancel() de psycopg2
+  (mismo efecto que pg_cancel_backend sobre el backend de la conexión)
+- SQLite: progress handler que aborta la sentencia si se venció el tiempo
+  o si el cliente se fue
+"""
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from dotenv import load_dotenv
+import asyncio
+import os
+import threading
+import time
+from app.database import engine, SessionLocal
+
+# Cargar variables de entorno
+load_dotenv()
+
+# Límites de tiempo por tipo de endpoint (milisegundos, 0 = sin límite)
+TIMEOUT_BUSCAR_MS = int(os.getenv("TIMEOUT_BUSCAR_MS", 2000))
+TIMEOUT_LECTURA_MS = int(os.getenv("TIMEOUT_LECTURA_MS", 5000))
+TIMEOUT_ESCRITURA_MS = int(os.getenv("TIMEOUT_ESCRITURA_MS", 10000))
+
+# Cada cuánto se revisa si el cliente sigue conectado (segundos)
+INTERVALO_VIGILANCIA = 0.1
+
+# Instrucciones de la VM de SQLite entre llamadas al progress handler
+INSTRUCCIONES_SQLITE = 1000
+
+# Status no estándar (usado por nginx) para "el cliente cerró la conexión"
+HTTP_499_CLIENTE_DESCONECTADO = 499
+
+# Contadores de trabajo cancelado, expuestos en /metricas
+contadores = {
+    "consultas_canceladas_por_desconexion": 0,
+    "consultas_canceladas_por_timeout": 0
+}
+_bloqueo_contadores = threading.Lock()
+
+
+def _incrementar(contador: str):
+    with _bloqueo_contadores:
+        contadores[contador] += 1
+
+
+class ConsultaCancelable:
+    """
+    Controla las consultas de una sesión para poder limitarlas y cancelarlas
+
+    CÓMO FUNCIONA:
+    - Al comenzar cada transacción de la sesión (after_begin) se configura
+      el límite de tiempo en la conexión y se registra qué sentencia corre
+    - Al terminar la transacción se quitan los hooks, porque la conexión
+      vuelve al pool y la puede usar otro request
+    - cancelar() interrumpe la sentencia en curso (si hay una) y hace
+      fallar las siguientes de la sesión
+
+    CONCURRENCIA:
+    cancelar() corre en el event loop y las sentencias en el threadpool.
+    El lock asegura que el cancel de PostgreSQL solo se envíe mientras
+    una sentencia de ESTA sesión está en curso: "ejecutando" vuelve a
+    False (con el lock) al terminar la sentencia, también si falla, así
+    que el cancel no puede llegar a otro request que reutilice la conexión.
+    """
+
+    def __init__(self, db, timeout_ms: int):
+        self.db = db
+        self.timeout_ms = timeout_ms
+        self.cancelado = threading.Event()
+        self._bloqueo = threading.Lock()
+        self.ejecutando = False
+        self.inicio_sentencia = 0.0
+        self.actual = None  # (Connection, conexión DBAPI, info del pool) de la transacción en curso
+        event.listen(db, "after_begin", self._al_comenzar)
+        event.listen(db, "after_transaction_end", self._al_terminar)
+
+    def _al_comenzar(self, session, transaction, connection):
+        """Configura la conexión usada por la transacción que comienza"""
+        dbapi = connection.connection.dbapi_connection
+        self.actual = (connection, dbapi, connection.info)
+        event.listen(connection, "before_cursor_execute", self._antes_de_ejecutar)
+        event.listen(connection, "after_cursor_execute", self._despues_de_ejecutar)
+        connection.info["consulta_cancelable"] = self
+
+        if connection.dialect.name == "postgresql":
+            if self.timeout_ms:
+                connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(self.timeout_ms)}")
+        elif connection.dialect.name == "sqlite":
+            dbapi.set_progress_handler(self._progreso_sqlite, INSTRUCCIONES_SQLITE)
+
+    def _al_terminar(self, session, transaction):
+        if transaction.parent is None:
+            self._soltar()
+
+    def _soltar(self):
+        """Quita los hooks de la conexión antes de que vuelva al pool"""
+        with self._bloqueo:
+            if self.actual is None:
+                return
+            connection, dbapi, info = self.actual
+            self.actual = None
+            self.ejecutando = False
+        event.remove(connection, "before_cursor_execute", self._antes_de_ejecutar)
+        event.remove(connection, "after_cursor_execute", self._despues_de_ejecutar)
+        # La conexión ya volvió al pool (after_transaction_end llega después):
+        # solo quitar la marca si no la tomó otro request
+        if info.get("consulta_cancelable") is self:
+            info.pop("consulta_cancelable", None)
+        if connection.dialect.name == "sqlite":
+            dbapi.set_progress_handler(None, 0)
+
+    def _antes_de_ejecutar(self, conn, cursor, statement, parameters, context, executemany):
+        with self._bloqueo:
+            # El cliente se fue entre dos sentencias: no ejecutar la siguiente
+            if self.cancelado.is_set():
+                raise OperationalError(statement, parameters, Exception("cancelada: el cliente se desconectó"))
+            self.inicio_sentencia = time.monotonic()
+            self.ejecutando = True
+
+    def _despues_de_ejecutar(self, conn, cursor, statement, parameters, context, executemany):
+        with self._bloqueo:
+            self.ejecutando = False
+
+    def _al_fallar(self):
+        """Una sentencia que falla no llega a after_cursor_execute"""
+        with self._bloqueo:
+            self.ejecutando = False
+
+    def _progreso_sqlite(self):
+        """Un valor distinto de 0 hace que SQLite aborte la sentencia"""
+        if self.cancelado.is_set():
+            return 1
+        if self.timeout_ms and (time.monotonic() - self.inicio_sentencia) * 1000 > self.timeout_ms:
+            return 1
+        return 0
+
+    def cancelar(self):
+        """Cancela la sentencia en curso (llamado desde el event loop)"""
+        with self._bloqueo:
+            self.cancelado.set()
+            if not self.ejecutando or self.actual is None:
+                return
+            connection, dbapi, _info = self.actual
+            if connection.dialect.name == "postgresql":
+                # Envía un cancel request al servidor (como pg_cancel_backend)
+                dbapi.cancel()
+            # En SQLite el progress handler ve el evento y aborta
+
+    def liberar(self):
+        """Quita todos los hooks (al cerrar la sesión)"""
+        event.remove(self.db, "after_begin", self._al_comenzar)
+        event.remove(self.db, "after_transaction_end", self._al_terminar)
+        self._soltar()
+
+
+@event.listens_for(engine, "handle_error")
+def _sentencia_fallida(contexto):
+    """
+    handle_error solo se puede escuchar en el engine (SQLAlchemy 2.0):
+    se busca la ConsultaCancelable de la conexión que falló
+    """
+    if contexto.connection is None:
+        return
+    consulta = contexto.connection.info.get("consulta_cancelable")
+    if consulta is not None:
+        consulta._al_fallar()
+
+
+def get_db_con_limite(timeout_ms: int, cancelar_al_desconectar: bool = True):
+    """
+    Crea una dependencia de FastAPI equivalente a get_db con límite de tiempo
+
+    PARÁMETROS:
+    - timeout_ms: Tiempo máximo por sentencia (0 = sin límite)
+    - cancelar_al_desconectar: Si el cliente se va, cancelar la consulta en curso
+
+    USO EN RUTAS:
+        @router.get("/buscar/nombre")
+        def buscar_rutinas(db: Session = Depends(get_db_con_limite(TIMEOUT_BUSCAR_MS))):
+            ...
+
+    ERRORES:
+    - 504: La sentencia superó el límite de tiempo
+    - 499: El cliente se desconectó y la sentencia fue cancelada
+    """
+    async def dependencia(request: Request):
+        db = SessionLocal()
+        consulta = ConsultaCancelable(db, timeout_ms)
+
+        async def vigilar():
+            while not await request.is_disconnected():
+                await asyncio.sleep(INTERVALO_VIGILANCIA)
+            consulta.cancelar()
+
+        vigilante = asyncio.create_task(vigilar()) if cancelar_al_desconectar else None
+        try:
+            yield db
+        except OperationalError as error:
+            if consulta.cancelado.is_set():
+                _incrementar("consultas_canceladas_por_desconexion")
+                raise HTTPException(
+                    status_code=HTTP_499_CLIENTE_DESCONECTADO,
+                    detail="Consulta cancelada: el cliente se desconectó"
+                )
+            if timeout_ms and es_timeout(error):
+                _incrementar("consultas_canceladas_por_timeout")
+                raise HTTPException(
+                    status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                    detail="La consulta superó el tiempo límite"
+                )
+            raise
+        finally:
+            if vigilante:
+                vigilante.cancel()
+            consulta.liberar()
+            db.close()
+
+    return dependencia
+
+
+def es_timeout(error: OperationalError) -> bool:
+    """
+    Indica si el error fue una sentencia cancelada por tiempo
+
+    - PostgreSQL: SQLSTATE 57014 (query_canceled)
+    - SQLite: "interrupted" (abortada por el progress handler)
+    """
+    if getattr(error.orig, "pgcode", None) == "57014":
+        return True
+    return "interrupted" in str(error.orig)
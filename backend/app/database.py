@@ -21,13 +21,37 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL no está configurada en .env")
 
+# Configuración del pool de conexiones
+# - DB_ECHO: muestra las queries SQL en la consola (útil para debugging)
+# - DB_POOL_SIZE: conexiones que el pool mantiene abiertas
+# - DB_MAX_OVERFLOW: conexiones extra permitidas en picos de carga
+DB_ECHO = os.getenv("DB_ECHO", "true").lower() == "true"
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+
+# Sentencias preparadas del lado del servidor (PostgreSQL)
+# Solo las soporta el driver psycopg 3 (DATABASE_URL=postgresql+psycopg://...):
+# una sentencia se prepara después de ejecutarse DB_PREPARE_THRESHOLD veces.
+# psycopg2 (el driver por defecto) no tiene sentencias preparadas.
+DB_PREPARE_THRESHOLD = int(os.getenv("DB_PREPARE_THRESHOLD", 5))
+
+# SQLite (usado en herramientas locales) no admite todas las opciones de pool
+opciones_engine = {}
+if not DATABASE_URL.startswith("sqlite"):
+    opciones_engine = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW
+    }
+if DATABASE_URL.startswith("postgresql+psycopg:"):
+    opciones_engine["connect_args"] = {"prepare_threshold": DB_PREPARE_THRESHOLD}
+
 # Crear motor de SQLAlchemy
-# - echo=True: muestra las queries SQL en la consola (útil para debugging)
 # - pool_pre_ping=True: verifica que la conexión esté viva antes de usarla
 engine = create_engine(
     DATABASE_URL,
-    echo=True,
-    pool_pre_ping=True
+    echo=DB_ECHO,
+    pool_pre_ping=True,
+    **opciones_engine
 )
 
 # SessionLocal es la clase que crea sesiones de base de datos
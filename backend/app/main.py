@@ -4,17 +4,21 @@ DESCRIPCIÓN: Punto de entrada principal de la aplicación FastAPI
 RESPONSABILIDADES:
 - Crear la aplicación FastAPI
 - Registrar routers
-- Crear tablas automáticamente
+- Crear tablas automáticamente (o verificar la versión en arranque rápido)
+- Exponer endpoints de liveness y readiness
 - Configurar CORS para acepta solicitudes desde frontend
 """
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
 import os
 
 # Importar configuración de BD y routers
-from app.database import engine, Base
+from app.arranque import iniciar, verificar_disponibilidad
+from app.cancelacion import contadores as contadores_cancelacion
+from app.sentencias import estadisticas_cache
 from app.routers import rutinas
 
 # Cargar variables de entorno
@@ -47,12 +51,12 @@ app.add_middleware(
 # CREAR TABLAS EN LA BASE DE DATOS
 # ============================================================================
 # Al iniciar, FastAPI crea automáticamente todas las tablas definidas en models.py
+# Con ARRANQUE_RAPIDO=true solo se verifica la versión del esquema (ver arranque.py)
 
 @app.on_event("startup")
 def startup_event():
     """Se ejecuta cuando FastAPI inicia"""
-    Base.metadata.create_all(bind=engine)
-    print("✓ Tablas de base de datos creadas exitosamente")
+    iniciar()
 
 
 # ============================================================================
@@ -94,6 +98,51 @@ def health_check():
     return {"status": "ok", "message": "API funcionando correctamente"}
 
 
+@app.get("/livez")
+def liveness_check():
+    """
+    Endpoint de liveness: el proceso está vivo y responde
+    NO consulta la base de datos (un fallo de BD no debe reiniciar el proceso)
+    
+    MÉTODO HTTP: GET /livez
+    RETORNA: Estado del proceso
+    """
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+def readiness_check():
+    """
+    Endpoint de readiness: la aplicación puede recibir tráfico
+    
+    MÉTODO HTTP: GET /readyz
+    RETORNA: Estado del arranque, de la base de datos y del pool
+    
+    CÓDIGOS HTTP:
+    - 200: Lista para recibir tráfico
+    - 503: Arranque incompleto, base de datos inaccesible o pool saturado
+    """
+    disponibilidad = verificar_disponibilidad()
+    codigo = 200 if disponibilidad["listo"] else 503
+    return JSONResponse(status_code=codigo, content=disponibilidad)
+
+
+@app.get("/metricas")
+def metricas():
+    """
+    Endpoint de métricas internas
+    
+    MÉTODO HTTP: GET /metricas
+    RETORNA:
+    - Contadores de consultas canceladas (por timeout o desconexión)
+    - Aciertos/fallos de la caché de sentencias compiladas de SQLAlchemy
+    """
+    return {
+        **contadores_cancelacion,
+        "cache_sentencias": estadisticas_cache()
+    }
+
+
 # ============================================================================
 # PUNTO DE ENTRADA
 # ============================================================================
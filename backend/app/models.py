@@ -7,12 +7,18 @@ RESPONSABILIDADES:
 - Validar tipos de datos
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, Boolean, UniqueConstraint, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
 from app.database import Base
 
+# Versión del esquema de la base de datos
+# IMPORTANTE: incrementar cada vez que se agregan o modifican tablas/columnas.
+# En modo de arranque rápido solo se compara este número en lugar de
+# inspeccionar todas las tablas.
+ESQUEMA_VERSION = 3
+
 
 class DiaSemanEnum(str, enum.Enum):
     """
@@ -28,6 +34,15 @@ class DiaSemanEnum(str, enum.Enum):
     DOMINGO = "Domingo"
 
 
+class OperacionCambioEnum(str, enum.Enum):
+    """
+    Enumeración de las operaciones registradas en el log de cambios
+    """
+    CREAR = "crear"
+    ACTUALIZAR = "actualizar"
+    ELIMINAR = "eliminar"
+
+
 class Rutina(Base):
     """
     MODELO: Rutina
@@ -94,7 +109,9 @@ class Ejercicio(Base):
     __tablename__ = "ejercicios"
 
     id = Column(Integer, primary_key=True, index=True)
-    rutina_id = Column(Integer, ForeignKey("rutinas.id", ondelete="CASCADE"), nullable=False)
+    # index=True: PostgreSQL no indexa las FOREIGN KEY automáticamente y esta
+    # columna se usa en el JOIN de cada consulta y al reemplazar ejercicios
+    rutina_id = Column(Integer, ForeignKey("rutinas.id", ondelete="CASCADE"), nullable=False, index=True)
     nombre = Column(String(255), nullable=False)
     dia_semana = Column(SQLEnum(DiaSemanEnum), nullable=False)
     series = Column(Integer, nullable=False)
@@ -108,4 +125,93 @@ class Ejercicio(Base):
     rutina = relationship("Rutina", back_populates="ejercicios")
 
     def __repr__(self):
-        return f"<Ejercicio(id={self.id}, nombre='{self.nombre}', dia='{self.dia_semana}')>"
\ No newline at end of file
+        return f"<Ejercicio(id={self.id}, nombre='{self.nombre}', dia='{self.dia_semana}')>"
+
+
+class CambioRutina(Base):
+    """
+    MODELO: CambioRutina
+    TABLA: cambios_rutinas
+    
+    DESCRIPCIÓN:
+    Log de cambios sobre las rutinas. Cada endpoint de escritura agrega una
+    entrada en la MISMA transacción que modifica la rutina, así el log nunca
+    queda desincronizado de los datos.
+    
+    CAMPOS:
+    - id: Cursor incremental (PRIMARY KEY). Los clientes piden cambios "desde" un cursor
+    - rutina_id: Rutina afectada (sin FOREIGN KEY: debe sobrevivir al borrado)
+    - operacion: crear, actualizar o eliminar
+    - fecha: Timestamp del cambio (se usa para compactar entradas viejas)
+    
+    NOTAS:
+    - Se guarda solo la última entrada por rutina (las anteriores se compactan)
+    - Las entradas "eliminar" funcionan como lápidas y se purgan por antigüedad
+    """
+    __tablename__ = "cambios_rutinas"
+    # En SQLite, sin AUTOINCREMENT se reutiliza el ID más alto si se borró:
+    # el cursor dejaría de crecer al reemplazar la última entrada
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = Column(Integer, primary_key=True, index=True)
+    rutina_id = Column(Integer, nullable=False, index=True)
+    operacion = Column(SQLEnum(OperacionCambioEnum), nullable=False)
+    fecha = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<CambioRutina(id={self.id}, rutina_id={self.rutina_id}, operacion='{self.operacion}')>"
+
+
+class RevisionRutina(Base):
+    """
+    MODELO: RevisionRutina
+    TABLA: revisiones_rutinas
+    
+    DESCRIPCIÓN:
+    Historial de versiones de una rutina. Cada actualización guarda solo lo
+    que cambió (delta) y cada cierta cantidad de revisiones se guarda una
+    copia completa (snapshot), así reconstruir cualquier versión requiere
+    como máximo un snapshot más unos pocos deltas.
+    
+    CAMPOS:
+    - id: Identificador único (PRIMARY KEY)
+    - rutina_id: Rutina a la que pertenece (FOREIGN KEY)
+    - numero: Número de revisión dentro de la rutina (1, 2, 3...)
+    - fecha: Timestamp de la revisión
+    - es_snapshot: True si "datos" es la rutina completa, False si es un delta
+    - datos: JSON compacto con el snapshot o el delta (ver revisiones.py)
+    """
+    __tablename__ = "revisiones_rutinas"
+    __table_args__ = (
+        UniqueConstraint("rutina_id", "numero", name="uq_revision_rutina_numero"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    rutina_id = Column(Integer, ForeignKey("rutinas.id", ondelete="CASCADE"), nullable=False, index=True)
+    numero = Column(Integer, nullable=False)
+    fecha = Column(DateTime, default=datetime.utcnow, nullable=False)
+    es_snapshot = Column(Boolean, nullable=False, default=False)
+    datos = Column(Text, nullable=False)
+
+    def __repr__(self):
+        return f"<RevisionRutina(rutina_id={self.rutina_id}, numero={self.numero}, snapshot={self.es_snapshot})>"
+
+
+class VersionEsquema(Base):
+    """
+    MODELO: VersionEsquema
+    TABLA: version_esquema
+    
+    DESCRIPCIÓN:
+    Guarda la versión del esquema creada por el último arranque completo.
+    Tiene una única fila.
+    
+    CAMPOS:
+    - version: Número de versión (PRIMARY KEY)
+    """
+    __tablename__ = "version_esquema"
+
+    version = Column(Integer, primary_key=True)
+
+    def __repr__(self):
+        return f"<VersionEsquema(version={self.version})>"
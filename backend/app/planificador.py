@@ -0,0 +1,285 @@
+"""
+MÓDULO: planificador.py
+DESCRIPCIÓN: Planificador de sobrecarga progresiva para los ejercicios de las rutinas
+RESPONSABILIDADES:
+- Cargar los ejercicios de una o varias rutinas como columnas (arreglos NumPy)
+- Proyectar peso, series y repeticiones semana a semana, con semanas de
+  descarga (deload) y topes por ejercicio
+- Escribir una semana del plan en la base, en bloque
+
+POR QUÉ COLUMNAS:
+El cálculo es el mismo para todos los ejercicios, así que se hace sobre
+arreglos de forma (semanas, ejercicios) en lugar de recorrer los
+ejercicios uno por uno en Python. Para 10.000 rutinas la proyección
+completa es una decena de operaciones NumPy.
+
+REGLAS DE LA PROYECCIÓN (la semana 1 es el estado actual):
+- Cada semana normal suma un incremento; las semanas de descarga no suman
+- Semana de descarga: cada "cada_deload" semanas, peso y series se
+  multiplican por "factor_deload"
+- Topes: peso <= peso inicial * tope_peso_factor; series y repeticiones
+  no superan su tope (salvo que el valor inicial ya sea mayor)
+- Series y repeticiones se redondean hacia abajo; el peso proyectado
+  también, al múltiplo de 0.5 kg (redondear hacia arriba podía pasar el tope)
+- En las semanas normales el peso nunca baja del inicial: redondear hacia
+  abajo no puede deshacer el progreso (62.3 kg sin incremento sigue en 62.3)
+- En las de descarga nunca baja de min(peso inicial, 0.5 kg): un ejercicio
+  liviano no termina en 0 kg (EjercicioResponse exige peso > 0)
+- Los ejercicios sin peso (peso corporal) siguen sin peso
+
+NUMPY:
+Este módulo importa NumPy (unos 70 ms): el router lo importa recién al
+llamar al endpoint, para no sumarlo al arranque de la aplicación.
+"""
+
+from sqlalchemy import select, update, bindparam
+from sqlalchemy.orm import Session
+import numpy as np
+from app.models import Rutina, Ejercicio, OperacionCambioEnum
+from app.cambios import registrar_cambios
+from app.revisiones import CAMPOS_EJERCICIO, estado_ejercicio, registrar_revisiones
+
+# Redondeo del peso proyectado (discos de 0.25 kg por lado)
+REDONDEO_PESO = 0.5
+
+# Columnas que se cargan de cada ejercicio, ordenadas por rutina y por ID
+# (el mismo orden que usa estado_rutina para las revisiones)
+_COLUMNAS = (
+    Ejercicio.id,
+    Ejercicio.rutina_id,
+    Ejercicio.nombre,
+    Ejercicio.series,
+    Ejercicio.repeticiones,
+    Ejercicio.peso
+)
+
+SELECT_COLUMNAS_TODAS = select(*_COLUMNAS).order_by(Ejercicio.rutina_id, Ejercicio.id)
+
+SELECT_COLUMNAS_POR_RUTINAS = select(*_COLUMNAS).where(
+    Ejercicio.rutina_id.in_(bindparam("rutina_ids", expanding=True))
+).order_by(Ejercicio.rutina_id, Ejercicio.id)
+
+SELECT_RUTINAS_EXISTENTES = select(Rutina.id).where(
+    Rutina.id.in_(bindparam("rutina_ids", expanding=True))
+)
+
+# Lock de las rutinas antes de escribir el plan (mismo criterio que
+# bloquear_rutina en sentencias.py); en orden de ID para evitar deadlocks
+SELECT_BLOQUEAR_TODAS = select(Rutina.id).order_by(Rutina.id).with_for_update()
+SELECT_BLOQUEAR_RUTINAS = select(Rutina.id).where(
+    Rutina.id.in_(bindparam("rutina_ids", expanding=True))
+).order_by(Rutina.id).with_for_update()
+
+# Estado de cada rutina para el historial, como columnas (sin cargar
+# objetos ORM): una fila por ejercicio, ordenadas por rutina y por ID
+_COLUMNAS_ESTADO = (
+    Rutina.id.label("rutina"),
+    Rutina.nombre.label("nombre_rutina"),
+    Rutina.descripcion.label("descripcion_rutina"),
+    Ejercicio.id,
+    *(getattr(Ejercicio, campo) for campo in CAMPOS_EJERCICIO)
+)
+SELECT_ESTADOS_TODAS = select(*_COLUMNAS_ESTADO).join(
+    Ejercicio, Ejercicio.rutina_id == Rutina.id
+).order_by(Rutina.id, Ejercicio.id)
+SELECT_ESTADOS_POR_RUTINAS = SELECT_ESTADOS_TODAS.where(
+    Rutina.id.in_(bindparam("rutina_ids", expanding=True))
+)
+
+
+def cargar_columnas(db: Session, rutina_ids=None) -> dict:
+    """
+    Carga los ejercicios como columnas
+
+    PARÁMETROS:
+    - rutina_ids: Rutinas a cargar (None = todas)
+
+    RETORNA:
+    - {"id", "rutina_id", "series", "repeticiones", "peso"} como arreglos
+      NumPy (peso en NaN si es NULL) y "nombre" como lista
+    """
+    if rutina_ids is None:
+        filas = db.execute(SELECT_COLUMNAS_TODAS).all()
+    else:
+        filas = db.execute(SELECT_COLUMNAS_POR_RUTINAS, {"rutina_ids": list(rutina_ids)}).all()
+
+    ids, rutinas, nombres, series, repeticiones, pesos = zip(*filas) if filas else ((),) * 6
+    return {
+        "id": np.array(ids, dtype=np.int64),
+        "rutina_id": np.array(rutinas, dtype=np.int64),
+        "nombre": list(nombres),
+        "series": np.array(series, dtype=np.int64),
+        "repeticiones": np.array(repeticiones, dtype=np.int64),
+        "peso": np.array(pesos, dtype=np.float64)  # None -> NaN
+    }
+
+
+def rutinas_inexistentes(db: Session, rutina_ids) -> list:
+    """IDs pedidos que no corresponden a ninguna rutina"""
+    existentes = set(db.execute(SELECT_RUTINAS_EXISTENTES, {"rutina_ids": list(rutina_ids)}).scalars())
+    return sorted(set(rutina_ids) - existentes)
+
+
+def bloquear_rutinas(db: Session, rutina_ids=None):
+    """Bloquea las rutinas (None = todas) hasta el fin de la transacción"""
+    if rutina_ids is None:
+        db.execute(SELECT_BLOQUEAR_TODAS)
+    else:
+        db.execute(SELECT_BLOQUEAR_RUTINAS, {"rutina_ids": list(rutina_ids)})
+
+
+def semanas_deload(semanas: int, cada_deload: int) -> np.ndarray:
+    """Máscara booleana (semanas,) de las semanas de descarga"""
+    numeros = np.arange(1, semanas + 1)
+    if cada_deload <= 0:
+        return np.zeros(semanas, dtype=bool)
+    return numeros % cada_deload == 0
+
+
+def proyectar(
+    columnas: dict,
+    semanas: int,
+    incremento_peso: float = 2.5,
+    incremento_series: float = 0,
+    incremento_repeticiones: float = 1,
+    cada_deload: int = 4,
+    factor_deload: float = 0.6,
+    tope_peso_factor: float = 1.5,
+    tope_series: int = 6,
+    tope_repeticiones: int = 15
+) -> dict:
+    """
+    Proyecta todos los ejercicios durante "semanas" semanas
+
+    RETORNA:
+    - {"deload": (semanas,), "series": (semanas, ejercicios),
+       "repeticiones": (semanas, ejercicios), "peso": (semanas, ejercicios)}
+      La fila 0 es la semana 1 (valores actuales, salvo que sea de descarga)
+    """
+    deload = semanas_deload(semanas, cada_deload)
+
+    # Cantidad de incrementos acumulados al llegar a cada semana:
+    # las semanas anteriores que no fueron de descarga
+    pasos = np.concatenate(([0], np.cumsum(~deload)[:-1]))[:, None]
+
+    series0 = columnas["series"][None, :]
+    repeticiones0 = columnas["repeticiones"][None, :]
+    peso0 = columnas["peso"][None, :]
+
+    series = np.minimum(
+        series0 + np.floor(pasos * incremento_series).astype(np.int64),
+        np.maximum(tope_series, series0)
+    )
+    repeticiones = np.minimum(
+        repeticiones0 + np.floor(pasos * incremento_repeticiones).astype(np.int64),
+        np.maximum(tope_repeticiones, repeticiones0)
+    )
+    peso = np.minimum(peso0 + pasos * incremento_peso, peso0 * tope_peso_factor)
+
+    # Semanas de descarga: menos peso y menos series (al menos una)
+    factor = np.where(deload, factor_deload, 1.0)[:, None]
+    series = np.where(deload[:, None], np.maximum(1, np.floor(series * factor)), series).astype(np.int64)
+    peso = peso * factor
+
+    # Redondear hacia abajo (nunca supera el tope) solo lo que cambió: la
+    # semana 1 conserva el peso actual. El épsilon evita que 62.5 se
+    # convierta en 62.0 por error de punto flotante.
+    modificadas = (pasos > 0) | deload[:, None]
+    redondeado = np.floor(peso / REDONDEO_PESO + 1e-9) * REDONDEO_PESO
+    redondeado = np.where(
+        deload[:, None],
+        np.maximum(redondeado, np.minimum(peso0, REDONDEO_PESO)),
+        np.maximum(redondeado, peso0)
+    )
+    peso = np.where(modificadas, redondeado, peso)
+
+    return {"deload": deload, "series": series, "repeticiones": repeticiones, "peso": peso}
+
+
+def aplicar_semana(db: Session, columnas: dict, plan: dict, semana: int, rutina_ids=None) -> int:
+    """
+    Escribe los valores de la semana "semana" en los ejercicios (NO hace commit)
+
+    Las rutinas deben estar bloqueadas (bloquear_rutinas) desde antes de
+    cargar las columnas, así el plan se calcula sobre el estado actual.
+
+    LÓGICA:
+    1. Detectar (vectorizado) los ejercicios cuyos valores cambian
+    2. Armar el estado anterior y el nuevo de cada rutina afectada, con
+       una sola consulta de columnas
+    3. Un solo UPDATE por clave primaria para todos los ejercicios
+    4. Registrar revisiones y cambios en bloque
+
+    COSTO: El historial necesita el estado completo de cada rutina
+    afectada; con todas las rutinas son tantos diccionarios como
+    ejercicios (sin objetos ORM).
+
+    RETORNA:
+    - Cantidad de ejercicios modificados
+    """
+    fila = semana - 1
+    series = plan["series"][fila]
+    repeticiones = plan["repeticiones"][fila]
+    peso = plan["peso"][fila]
+
+    iguales_peso = (peso == columnas["peso"]) | (np.isnan(peso) & np.isnan(columnas["peso"]))
+    cambiados = (series != columnas["series"]) | (repeticiones != columnas["repeticiones"]) | ~iguales_peso
+    if not cambiados.any():
+        return 0
+
+    valores = {
+        int(ejercicio_id): {"series": int(s), "repeticiones": int(r), "peso": None if np.isnan(p) else float(p)}
+        for ejercicio_id, s, r, p in zip(
+            columnas["id"][cambiados], series[cambiados], repeticiones[cambiados], peso[cambiados]
+        )
+    }
+    afectadas = set(np.unique(columnas["rutina_id"][cambiados]).tolist())
+
+    # Estados para el historial (antes del UPDATE). Se filtra por las
+    # rutinas pedidas, no por las afectadas, para no armar un IN enorme
+    if rutina_ids is None:
+        filas = db.execute(SELECT_ESTADOS_TODAS)
+    else:
+        filas = db.execute(SELECT_ESTADOS_POR_RUTINAS, {"rutina_ids": list(rutina_ids)})
+    estados = {}
+    for fila_estado in filas:
+        if fila_estado.rutina not in afectadas:
+            continue
+        if fila_estado.rutina not in estados:
+            base = {"nombre": fila_estado.nombre_rutina, "descripcion": fila_estado.descripcion_rutina}
+            estados[fila_estado.rutina] = ({**base, "ejercicios": []}, {**base, "ejercicios": []})
+        anterior, nuevo = estados[fila_estado.rutina]
+        ejercicio = estado_ejercicio(fila_estado)
+        anterior["ejercicios"].append(ejercicio)
+        nuevo["ejercicios"].append({**ejercicio, **valores.get(fila_estado.id, {})})
+
+    db.execute(update(Ejercicio), [{"id": ejercicio_id, **v} for ejercicio_id, v in valores.items()])
+    registrar_revisiones(db, estados)
+    registrar_cambios(db, sorted(afectadas), OperacionCambioEnum.ACTUALIZAR)
+    return len(valores)
+
+
+def a_respuesta(columnas: dict, plan: dict) -> dict:
+    """
+    Arma la respuesta del endpoint: por ejercicio, una lista por campo
+    Se transpone una sola vez para todos los ejercicios.
+    """
+    peso = np.where(np.isnan(plan["peso"]), None, plan["peso"]).T.tolist()
+    series = plan["series"].T.tolist()
+    repeticiones = plan["repeticiones"].T.tolist()
+    return {
+        "deload": (np.flatnonzero(plan["deload"]) + 1).tolist(),
+        "ejercicios": [
+            {
+                "id": ejercicio_id,
+                "rutina_id": rutina_id,
+                "nombre": nombre,
+                "series": series[i],
+                "repeticiones": repeticiones[i],
+                "peso": peso[i]
+            }
+            for i, (ejercicio_id, rutina_id, nombre) in enumerate(zip(
+                columnas["id"].tolist(), columnas["rutina_id"].tolist(), columnas["nombre"]
+            ))
+        ]
+    }
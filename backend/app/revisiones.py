@@ -0,0 +1,259 @@
+"""
+MÓDULO: revisiones.py
+DESCRIPCIÓN: Historial de revisiones de rutinas guardado como deltas
+RESPONSABILIDADES:
+- Convertir una rutina a un "estado" (diccionario serializable)
+- Calcular el delta entre dos estados y aplicarlo
+- Registrar una revisión en cada actualización (delta o snapshot periódico)
+- Reconstruir una rutina tal como estaba en la revisión N
+
+FORMATO DEL ESTADO:
+    {"nombre": ..., "descripcion": ..., "ejercicios": [{nombre, dia_semana,
+     series, repeticiones, peso, notas, orden}, ...]}
+actualizar_rutina vuelve a crear los ejercicios en cada edición, así que
+sus IDs no se mantienen entre versiones: se emparejan por contenido (la
+subsecuencia común más larga de difflib), no por posición. Insertar o
+quitar un ejercicio al principio no marca como cambiados a los siguientes.
+
+FORMATO DEL DELTA (solo se incluyen las claves que cambiaron):
+    {"campos": {"nombre": "Nuevo"},
+     "ejercicios": {"eliminados": [2],                   # índices en el estado anterior
+                    "cambios": {"0": {"peso": 80.0}},    # índices en el estado nuevo
+                    "insertados": {"1": {...ejercicio completo...}}}}
+"""
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from dotenv import load_dotenv
+from difflib import SequenceMatcher
+import json
+import os
+from app.models import RevisionRutina
+
+# Cargar variables de entorno
+load_dotenv()
+
+# Cada cuántas revisiones se guarda un snapshot completo
+# Reconstruir una versión aplica como máximo REVISIONES_SNAPSHOT_CADA - 1 deltas
+REVISIONES_SNAPSHOT_CADA = int(os.getenv("REVISIONES_SNAPSHOT_CADA", 10))
+
+# Campos de la rutina y de cada ejercicio que forman parte del estado
+CAMPOS_RUTINA = ("nombre", "descripcion")
+CAMPOS_EJERCICIO = ("nombre", "dia_semana", "series", "repeticiones", "peso", "notas", "orden")
+
+
+def estado_ejercicio(ejercicio) -> dict:
+    """Convierte un Ejercicio (ORM o esquema Pydantic) a diccionario"""
+    estado = {campo: getattr(ejercicio, campo) for campo in CAMPOS_EJERCICIO}
+    estado["dia_semana"] = getattr(estado["dia_semana"], "value", estado["dia_semana"])
+    return estado
+
+
+def estado_rutina(rutina) -> dict:
+    """Convierte una Rutina ORM a estado (ejercicios en orden de creación)"""
+    return {
+        "nombre": rutina.nombre,
+        "descripcion": rutina.descripcion,
+        "ejercicios": [
+            estado_ejercicio(e) for e in sorted(rutina.ejercicios, key=lambda e: e.id or 0)
+        ]
+    }
+
+
+def _clave_ejercicio(ejercicio: dict) -> tuple:
+    return tuple(ejercicio[campo] for campo in CAMPOS_EJERCICIO)
+
+
+def calcular_delta(anterior: dict, nuevo: dict) -> dict:
+    """
+    Calcula lo que cambió de "anterior" a "nuevo"
+
+    Los ejercicios iguales en ambos estados se emparejan con
+    SequenceMatcher; en cada tramo distinto, los primeros ejercicios de
+    cada lado se guardan como modificados (solo los campos que cambian)
+    y el resto como eliminados o insertados.
+
+    RETORNA:
+    - Delta con solo los campos modificados ({} si no hubo cambios)
+    """
+    delta = {}
+
+    campos = {c: nuevo[c] for c in CAMPOS_RUTINA if anterior[c] != nuevo[c]}
+    if campos:
+        delta["campos"] = campos
+
+    viejos, nuevos = anterior["ejercicios"], nuevo["ejercicios"]
+    comparador = SequenceMatcher(
+        None, [_clave_ejercicio(e) for e in viejos], [_clave_ejercicio(e) for e in nuevos], autojunk=False
+    )
+    eliminados, cambios, insertados = [], {}, {}
+    for operacion, i1, i2, j1, j2 in comparador.get_opcodes():
+        if operacion == "equal":
+            continue
+        pares = min(i2 - i1, j2 - j1)
+        for i, j in zip(range(i1, i1 + pares), range(j1, j1 + pares)):
+            cambios[str(j)] = {c: nuevos[j][c] for c in CAMPOS_EJERCICIO if viejos[i][c] != nuevos[j][c]}
+        eliminados.extend(range(i1 + pares, i2))
+        for j in range(j1 + pares, j2):
+            insertados[str(j)] = nuevos[j]
+
+    ejercicios = {}
+    if eliminados:
+        ejercicios["eliminados"] = eliminados
+    if cambios:
+        ejercicios["cambios"] = cambios
+    if insertados:
+        ejercicios["insertados"] = insertados
+    if ejercicios:
+        delta["ejercicios"] = ejercicios
+
+    return delta
+
+
+def aplicar_delta(estado: dict, delta: dict) -> dict:
+    """Retorna un nuevo estado con el delta aplicado (no modifica "estado")"""
+    resultado = {**estado, **delta.get("campos", {})}
+
+    if "ejercicios" in delta:
+        cambios = delta["ejercicios"]
+        # Los que quedan, en orden; los insertados ocupan su índice en el nuevo
+        eliminados = set(cambios.get("eliminados", []))
+        quedan = iter([e for i, e in enumerate(estado["ejercicios"]) if i not in eliminados])
+        insertados = cambios.get("insertados", {})
+        modificados = cambios.get("cambios", {})
+        longitud = len(estado["ejercicios"]) - len(eliminados) + len(insertados)
+
+        ejercicios = []
+        for j in range(longitud):
+            if str(j) in insertados:
+                ejercicios.append(dict(insertados[str(j)]))
+            else:
+                ejercicios.append({**next(quedan), **modificados.get(str(j), {})})
+        resultado["ejercicios"] = ejercicios
+
+    return resultado
+
+
+def _serializar(datos: dict) -> str:
+    """JSON compacto (sin espacios) para que el delta ocupe lo mínimo"""
+    return json.dumps(datos, separators=(",", ":"), ensure_ascii=False)
+
+
+def ultimo_numero(db: Session, rutina_id: int) -> int:
+    """Número de la última revisión de la rutina (0 si no tiene)"""
+    return db.query(func.max(RevisionRutina.numero)).filter(
+        RevisionRutina.rutina_id == rutina_id
+    ).scalar() or 0
+
+
+def registrar_revision(db: Session, rutina_id: int, anterior: dict, nuevo: dict):
+    """
+    Agrega una revisión dentro de la transacción actual (NO hace commit)
+
+    CÓMO FUNCIONA:
+    - Si la rutina no tiene historial (anterior a esta funcionalidad), se
+      guarda primero "anterior" como revisión 1 (snapshot)
+    - Cada REVISIONES_SNAPSHOT_CADA revisiones se guarda un snapshot completo
+    - En las demás, solo el delta entre "anterior" y "nuevo"
+    - Si no hubo cambios, no se guarda nada
+
+    PARÁMETROS:
+    - anterior: Estado antes de la edición (None al crear la rutina)
+    - nuevo: Estado después de la edición
+    """
+    _agregar_revision(db, rutina_id, ultimo_numero(db, rutina_id), anterior, nuevo)
+
+
+def registrar_revisiones(db: Session, estados: dict):
+    """
+    Versión masiva de registrar_revision (NO hace commit)
+
+    PARÁMETROS:
+    - estados: Diccionario rutina_id -> (anterior, nuevo)
+
+    Los últimos números de revisión se obtienen con una sola consulta.
+    """
+    if not estados:
+        return
+    numeros = dict(
+        db.query(RevisionRutina.rutina_id, func.max(RevisionRutina.numero)).filter(
+            RevisionRutina.rutina_id.in_(list(estados))
+        ).group_by(RevisionRutina.rutina_id).all()
+    )
+    for rutina_id, (anterior, nuevo) in estados.items():
+        _agregar_revision(db, rutina_id, numeros.get(rutina_id, 0), anterior, nuevo)
+
+
+def _agregar_revision(db: Session, rutina_id: int, numero: int, anterior: dict, nuevo: dict):
+    """Agrega la revisión siguiente a "numero" (ver registrar_revision)"""
+    if anterior is not None and numero == 0:
+        numero = 1
+        db.add(RevisionRutina(rutina_id=rutina_id, numero=1, es_snapshot=True, datos=_serializar(anterior)))
+
+    if anterior is None:
+        delta = None
+    else:
+        delta = calcular_delta(anterior, nuevo)
+        if not delta:
+            return
+
+    numero += 1
+    es_snapshot = delta is None or (numero - 1) % REVISIONES_SNAPSHOT_CADA == 0
+    db.add(RevisionRutina(
+        rutina_id=rutina_id,
+        numero=numero,
+        es_snapshot=es_snapshot,
+        datos=_serializar(nuevo if es_snapshot else delta)
+    ))
+
+
+def listar_revisiones(db: Session, rutina_id: int):
+    """Revisiones de la rutina, de la más vieja a la más nueva"""
+    return db.query(RevisionRutina).filter(
+        RevisionRutina.rutina_id == rutina_id
+    ).order_by(RevisionRutina.numero.asc()).all()
+
+
+def reconstruir(db: Session, rutina_id: int, numero: int):
+    """
+    Reconstruye la rutina tal como estaba en la revisión "numero"
+
+    LÓGICA:
+    1. Buscar el snapshot más reciente con número <= "numero"
+    2. Traer ese snapshot y los deltas posteriores hasta "numero"
+    3. Aplicar los deltas en orden
+
+    RETORNA:
+    - (estado, revisión) o (None, None) si la revisión no existe
+    """
+    desde = db.query(func.max(RevisionRutina.numero)).filter(
+        RevisionRutina.rutina_id == rutina_id,
+        RevisionRutina.es_snapshot.is_(True),
+        RevisionRutina.numero <= numero
+    ).scalar()
+    if desde is None:
+        return None, None
+
+    revisiones = db.query(RevisionRutina).filter(
+        RevisionRutina.rutina_id == rutina_id,
+        RevisionRutina.numero >= desde,
+        RevisionRutina.numero <= numero
+    ).order_by(RevisionRutina.numero.asc()).all()
+    if revisiones[-1].numero != numero:
+        return None, None
+
+    estado = json.loads(revisiones[0].datos)
+    for revision in revisiones[1:]:
+        estado = aplicar_delta(estado, json.loads(revision.datos))
+    return estado, revisiones[-1]
+
+
+def eliminar_historial(db: Session, rutina_id: int):
+    """
+    Elimina las revisiones de una rutina (NO hace commit)
+    PostgreSQL ya lo hace con ON DELETE CASCADE; SQLite no aplica FOREIGN KEY
+    por defecto, por eso se borra explícitamente.
+    """
+    db.query(RevisionRutina).filter(
+        RevisionRutina.rutina_id == rutina_id
+    ).delete(synchronize_session=False)
@@ -10,16 +10,52 @@ RESPONSABILIDADES:
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import Response, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from typing import List
+from typing import List, Optional
+from datetime import date, timedelta
+import asyncio
+import time
 from app.database import get_db
-from app.models import Rutina, Ejercicio, DiaSemanEnum
+from app.models import Rutina, Ejercicio, DiaSemanEnum, OperacionCambioEnum
+from app.cambios import registrar_cambio, obtener_cambios
+from app.calendario import crear_plantilla, expandir_sesiones, a_ndjson, a_icalendar
+from app.revisiones import (
+    estado_rutina,
+    estado_ejercicio,
+    registrar_revision,
+    listar_revisiones,
+    reconstruir,
+    calcular_delta,
+    eliminar_historial
+)
+from app.sentencias import (
+    bloquear_rutina,
+    obtener_rutina_por_id,
+    existe_nombre,
+    buscar_por_nombre,
+    eliminar_ejercicios
+)
+from app.cancelacion import (
+    get_db_con_limite,
+    TIMEOUT_BUSCAR_MS,
+    TIMEOUT_LECTURA_MS,
+    TIMEOUT_ESCRITURA_MS
+)
 from app.schemas import (
     RutinaCreate,
     RutinaUpdate,
     RutinaResponse,
     RutinaDetailResponse,
+    CambiosResponse,
+    RevisionResponse,
+    RutinaRevisionResponse,
+    DiffRevisionesResponse,
+    PlanProgresionRequest,
+    PlanProgresionResponse,
+    FormatoCalendarioEnum,
     EjercicioCreate,
     EjercicioUpdate,
     EjercicioResponse
@@ -30,13 +66,23 @@ router = APIRouter(
     tags=["rutinas"]
 )
 
+# Intervalo entre consultas al log mientras se espera un cambio (long-polling)
+INTERVALO_ESPERA_CAMBIOS = 0.5
+
+# Sesiones con límite de tiempo por tipo de endpoint (ver cancelacion.py)
+# - Lecturas: si el cliente se desconecta, se cancela la consulta en curso
+# - Escrituras: solo límite de tiempo (no se abandona una escritura a mitad)
+get_db_lectura = get_db_con_limite(TIMEOUT_LECTURA_MS)
+get_db_busqueda = get_db_con_limite(TIMEOUT_BUSCAR_MS)
+get_db_escritura = get_db_con_limite(TIMEOUT_ESCRITURA_MS, cancelar_al_desconectar=False)
+
 
 # ============================================================================
 # ENDPOINTS DE RUTINAS
 # ============================================================================
 
 @router.get("", response_model=List[RutinaDetailResponse])
-def listar_rutinas(db: Session = Depends(get_db)):
+def listar_rutinas(db: Session = Depends(get_db_lectura)):
     """
     OPERACIÓN: LISTAR TODAS LAS RUTINAS CON EJERCICIOS
     
@@ -69,8 +115,147 @@ def listar_rutinas(db: Session = Depends(get_db)):
     return rutinas
 
 
+def _consultar_cambios(db: Session, desde: int) -> CambiosResponse:
+    """Consulta el log y valida la respuesta (se ejecuta en el threadpool)"""
+    return CambiosResponse.model_validate(obtener_cambios(db, desde))
+
+
+@router.get("/cambios", response_model=CambiosResponse)
+async def listar_cambios(
+    desde: int = Query(0, ge=0),
+    espera: int = Query(0, ge=0, le=30),
+    db: Session = Depends(get_db)
+):
+    """
+    OPERACIÓN: OBTENER CAMBIOS DESDE UN CURSOR (SINCRONIZACIÓN INCREMENTAL)
+    
+    MÉTODO HTTP: GET /api/rutinas/cambios?desde={cursor}&espera={segundos}
+    
+    DESCRIPCIÓN:
+    Retorna solo las rutinas creadas, actualizadas o eliminadas después del
+    cursor indicado, para que el cliente actualice su copia local sin
+    volver a descargar la lista completa.
+    
+    PARÁMETROS:
+    - desde: Último cursor recibido (0 = primera carga, retorna todo)
+    - espera: Segundos a esperar si no hay cambios (long-polling, máx 30)
+    - db: Sesión de base de datos (inyectada automáticamente)
+    
+    RETORNA:
+    - cursor: Cursor para la próxima consulta
+    - completo: True si "rutinas" es la lista completa (reemplazar copia local)
+    - rutinas: Rutinas nuevas o modificadas CON ejercicios
+    - eliminadas: IDs de rutinas eliminadas
+    
+    CÓDIGOS HTTP:
+    - 200: Éxito (listas vacías si no hubo cambios)
+    
+    LÓGICA:
+    1. Consultar el log de cambios después del cursor
+    2. Si no hay cambios y se pidió espera, volver a consultar hasta que
+       aparezca alguno o se agote el tiempo
+    3. Retornar el delta (o la lista completa si el cursor es muy viejo)
+    
+    NOTA: Se declara antes de /{rutina_id} para que "cambios" no se
+    interprete como un ID.
+    
+    NOTA: Es async para que la espera (asyncio.sleep) no ocupe un hilo
+    del threadpool. Las consultas, la validación y la conversión a JSON se
+    hacen en el threadpool (ver _consultar_cambios): con miles de rutinas
+    validarlas en el event loop frenaría a todos los demás requests.
+    """
+    limite = time.monotonic() + espera
+    while True:
+        cambios = await run_in_threadpool(_consultar_cambios, db, desde)
+        if cambios.completo or cambios.cursor != desde or time.monotonic() >= limite:
+            contenido = await run_in_threadpool(cambios.model_dump_json)
+            return Response(content=contenido, media_type="application/json")
+        # Terminar la transacción (devuelve la conexión al pool durante la
+        # espera) para ver los commits de otros requests
+        await run_in_threadpool(db.rollback)
+        await asyncio.sleep(INTERVALO_ESPERA_CAMBIOS)
+
+
+@router.post("/progresion", response_model=PlanProgresionResponse)
+def planificar_progresion(solicitud: PlanProgresionRequest, db: Session = Depends(get_db_escritura)):
+    """
+    OPERACIÓN: PLAN DE SOBRECARGA PROGRESIVA
+    
+    MÉTODO HTTP: POST /api/rutinas/progresion
+    
+    DESCRIPCIÓN:
+    Proyecta peso, series y repeticiones de todos los ejercicios de una o
+    varias rutinas (o de todas) semana a semana, con semanas de descarga y
+    topes. Opcionalmente guarda una de las semanas en los ejercicios.
+    
+    PARÁMETROS:
+    - solicitud: Rutinas, cantidad de semanas, incrementos, descarga, topes
+      y semana a aplicar (ver PlanProgresionRequest)
+    - db: Sesión de base de datos (inyectada automáticamente)
+    
+    RETORNA:
+    - Por ejercicio, una lista por campo con un valor por semana
+    
+    CÓDIGOS HTTP:
+    - 200: Éxito
+    - 404: Alguna de las rutinas pedidas no existe
+    - 422: Parámetros inválidos
+    
+    LÓGICA:
+    1. Cargar los ejercicios como columnas (ver planificador.py)
+    2. Calcular la proyección completa de forma vectorizada
+    3. Si se pide aplicar una semana: un UPDATE en bloque, revisiones y
+       registro de cambios de las rutinas afectadas, y commit (las rutinas
+       se bloquean antes del paso 1)
+    
+    NOTA: Usa la sesión de escritura (no se cancela si el cliente se
+    desconecta) porque el mismo endpoint puede guardar el plan.
+    """
+    # Import diferido: planificador.py carga NumPy (~70 ms), que no debe
+    # sumarse al arranque de la aplicación por un endpoint poco usado
+    from app.planificador import (
+        bloquear_rutinas,
+        rutinas_inexistentes,
+        cargar_columnas,
+        proyectar,
+        aplicar_semana,
+        a_respuesta
+    )
+    
+    if solicitud.rutina_ids is not None:
+        faltantes = rutinas_inexistentes(db, solicitud.rutina_ids)
+        if faltantes:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Rutinas no encontradas: {faltantes}"
+            )
+    
+    # Al escribir, bloquear antes de leer: el plan se calcula sobre el
+    # estado que se va a modificar (ver bloquear_rutina en sentencias.py)
+    if solicitud.aplicar_semana is not None:
+        bloquear_rutinas(db, solicitud.rutina_ids)
+    
+    columnas = cargar_columnas(db, solicitud.rutina_ids)
+    plan = proyectar(
+        columnas,
+        **solicitud.model_dump(exclude={"rutina_ids", "aplicar_semana"})
+    )
+    
+    modificados = 0
+    if solicitud.aplicar_semana is not None:
+        modificados = aplicar_semana(db, columnas, plan, solicitud.aplicar_semana, solicitud.rutina_ids)
+        db.commit()
+    
+    return {
+        "semanas": solicitud.semanas,
+        "aplicada": solicitud.aplicar_semana,
+        "ejercicios_modificados": modificados,
+        **a_respuesta(columnas, plan)
+    }
+
+
 @router.get("/{rutina_id}", response_model=RutinaDetailResponse)
-def obtener_rutina(rutina_id: int, db: Session = Depends(get_db)):
+def obtener_rutina(rutina_id: int, db: Session = Depends(get_db_lectura)):
     """
     OPERACIÓN: OBTENER DETALLE DE UNA RUTINA
     
@@ -95,8 +280,10 @@ def obtener_rutina(rutina_id: int, db: Session = Depends(get_db)):
     1. Buscar rutina por ID
     2. Si no existe, retornar error 404
     3. Si existe, retornarla con sus ejercicios
+    
+    CAMBIO: Usa una sentencia precompilada (ver sentencias.py)
     """
-    rutina = db.query(Rutina).filter(Rutina.id == rutina_id).first()
+    rutina = obtener_rutina_por_id(db, rutina_id)
     
     if not rutina:
         raise HTTPException(
@@ -108,7 +295,7 @@ def obtener_rutina(rutina_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/buscar/nombre", response_model=List[RutinaDetailResponse])
-def buscar_rutinas(nombre: str = Query(..., min_length=1), db: Session = Depends(get_db)):
+def buscar_rutinas(nombre: str = Query(..., min_length=1), db: Session = Depends(get_db_busqueda)):
     """
     OPERACIÓN: BUSCAR RUTINAS POR NOMBRE (CON EJERCICIOS)
     
@@ -129,22 +316,21 @@ def buscar_rutinas(nombre: str = Query(..., min_length=1), db: Session = Depends
     
     CÓDIGOS HTTP:
     - 200: Éxito
+    - 504: La búsqueda superó TIMEOUT_BUSCAR_MS
+    - 499: El cliente se desconectó (la consulta se cancela en la BD)
     
     LÓGICA:
     1. Usar ILIKE para búsqueda case-insensitive
     2. Búsqueda parcial: "ABC%" + "%ABC" = contiene "ABC"
     3. Retornar todas las coincidencias CON ejercicios
-    """
-    busqueda = f"%{nombre}%"
-    rutinas = db.query(Rutina).filter(
-        Rutina.nombre.ilike(busqueda)
-    ).order_by(Rutina.fecha_creacion.desc()).all()
     
-    return rutinas
+    CAMBIO: Usa una sentencia precompilada (ver sentencias.py)
+    """
+    return buscar_por_nombre(db, nombre)
 
 
 @router.post("", response_model=RutinaDetailResponse, status_code=status.HTTP_201_CREATED)
-def crear_rutina(rutina: RutinaCreate, db: Session = Depends(get_db)):
+def crear_rutina(rutina: RutinaCreate, db: Session = Depends(get_db_escritura)):
     """
     OPERACIÓN: CREAR NUEVA RUTINA CON EJERCICIOS
     
@@ -207,8 +393,7 @@ def crear_rutina(rutina: RutinaCreate, db: Session = Depends(get_db)):
     }
     """
     # Verificar que el nombre sea único
-    existente = db.query(Rutina).filter(Rutina.nombre == rutina.nombre).first()
-    if existente:
+    if existe_nombre(db, rutina.nombre):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Ya existe una rutina con el nombre '{rutina.nombre}'"
@@ -234,8 +419,11 @@ def crear_rutina(rutina: RutinaCreate, db: Session = Depends(get_db)):
             )
             nueva_rutina.ejercicios.append(ejercicio)
     
-    # Guardar en BD
+    # Guardar en BD (flush para obtener el ID antes de registrar el cambio)
     db.add(nueva_rutina)
+    db.flush()
+    registrar_cambio(db, nueva_rutina.id, OperacionCambioEnum.CREAR)
+    registrar_revision(db, nueva_rutina.id, None, estado_rutina(nueva_rutina))
     db.commit()
     db.refresh(nueva_rutina)
     
@@ -246,7 +434,7 @@ def crear_rutina(rutina: RutinaCreate, db: Session = Depends(get_db)):
 def actualizar_rutina(
     rutina_id: int,
     rutina_update: RutinaUpdate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_escritura)
 ):
     """
     OPERACIÓN: ACTUALIZAR RUTINA (NOMBRE, DESCRIPCIÓN Y EJERCICIOS)
@@ -277,9 +465,17 @@ def actualizar_rutina(
     5. Manejar actualización de ejercicios:
        - Eliminar todos los ejercicios antiguos
        - Crear todos los nuevos ejercicios
-    6. Guardar cambios
+    6. Registrar la revisión (solo el delta de lo que cambió)
+    7. Guardar cambios
+    
+    CAMBIO: Usa sentencias precompiladas (ver sentencias.py)
+    
+    CONCURRENCIA: La fila de la rutina se bloquea primero, así dos PUT
+    sobre la misma rutina no calculan su delta desde el mismo estado ni
+    chocan en el número de revisión.
     """
-    rutina = db.query(Rutina).filter(Rutina.id == rutina_id).first()
+    bloquear_rutina(db, rutina_id)
+    rutina = obtener_rutina_por_id(db, rutina_id)
     
     if not rutina:
         raise HTTPException(
@@ -287,12 +483,13 @@ def actualizar_rutina(
             detail=f"Rutina con ID {rutina_id} no encontrada"
         )
     
+    # Estado previo, para guardar en el historial solo lo que cambia
+    anterior = estado_rutina(rutina)
+    ejercicios_nuevos = None
+    
     # Validar nombre único si cambió
     if rutina_update.nombre and rutina_update.nombre != rutina.nombre:
-        existente = db.query(Rutina).filter(
-            Rutina.nombre == rutina_update.nombre
-        ).first()
-        if existente:
+        if existe_nombre(db, rutina_update.nombre):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Ya existe una rutina con el nombre '{rutina_update.nombre}'"
@@ -307,10 +504,11 @@ def actualizar_rutina(
     # SIMPLIFICADO: Manejar actualización de ejercicios
     if rutina_update.ejercicios is not None:
         # Eliminar todos los ejercicios existentes
-        db.query(Ejercicio).filter(Ejercicio.rutina_id == rutina_id).delete()
+        eliminar_ejercicios(db, rutina_id)
         db.flush()  # Asegurar que se eliminen antes de crear nuevos
         
         # Crear nuevos ejercicios
+        ejercicios_nuevos = []
         for idx, ej_data in enumerate(rutina_update.ejercicios):
             nuevo_ej = Ejercicio(
                 rutina_id=rutina_id,
@@ -323,7 +521,18 @@ def actualizar_rutina(
                 orden=ej_data.orden if ej_data.orden is not None else idx
             )
             db.add(nuevo_ej)
+            ejercicios_nuevos.append(nuevo_ej)
+    
+    # Registrar la revisión (el estado nuevo se arma sin volver a consultar)
+    nuevo = {
+        "nombre": rutina.nombre,
+        "descripcion": rutina.descripcion,
+        "ejercicios": anterior["ejercicios"] if ejercicios_nuevos is None
+        else [estado_ejercicio(e) for e in ejercicios_nuevos]
+    }
+    registrar_revision(db, rutina_id, anterior, nuevo)
     
+    registrar_cambio(db, rutina_id, OperacionCambioEnum.ACTUALIZAR)
     db.commit()
     db.refresh(rutina)
     
@@ -331,7 +540,7 @@ def actualizar_rutina(
 
 
 @router.delete("/{rutina_id}", status_code=status.HTTP_204_NO_CONTENT)
-def eliminar_rutina(rutina_id: int, db: Session = Depends(get_db)):
+def eliminar_rutina(rutina_id: int, db: Session = Depends(get_db_escritura)):
     """
     OPERACIÓN: ELIMINAR RUTINA
     
@@ -354,7 +563,7 @@ def eliminar_rutina(rutina_id: int, db: Session = Depends(get_db)):
     3. Eliminar la rutina (SQLAlchemy elimina automáticamente sus ejercicios)
     4. Confirmar cambios
     """
-    rutina = db.query(Rutina).filter(Rutina.id == rutina_id).first()
+    rutina = obtener_rutina_por_id(db, rutina_id)
     
     if not rutina:
         raise HTTPException(
@@ -362,10 +571,187 @@ def eliminar_rutina(rutina_id: int, db: Session = Depends(get_db)):
             detail=f"Rutina con ID {rutina_id} no encontrada"
         )
     
+    eliminar_historial(db, rutina_id)
     db.delete(rutina)
+    registrar_cambio(db, rutina_id, OperacionCambioEnum.ELIMINAR)
     db.commit()
 
 
+@router.get("/{rutina_id}/calendario")
+def calendario_rutina(
+    rutina_id: int,
+    desde: Optional[date] = None,
+    semanas: int = Query(12, ge=1, le=52),
+    hasta: Optional[date] = None,
+    formato: FormatoCalendarioEnum = FormatoCalendarioEnum.NDJSON,
+    db: Session = Depends(get_db_lectura)
+):
+    """
+    OPERACIÓN: CALENDARIO DE SESIONES DE UNA RUTINA
+    
+    MÉTODO HTTP: GET /api/rutinas/{rutina_id}/calendario?desde=&semanas=&hasta=&formato=
+    
+    DESCRIPCIÓN:
+    La rutina es una plantilla semanal (ejercicios por día). Este endpoint
+    la expande a sesiones con fecha concreta, agrupando los ejercicios de
+    cada fecha, y las envía a medida que se generan (streaming).
+    
+    PARÁMETROS:
+    - desde: Primer día de la ventana (por defecto hoy)
+    - semanas: Largo de la ventana en semanas (1 a 52, por defecto 12)
+    - hasta: Fecha de corte opcional (excluida), para pedir ventanas más cortas
+    - formato: "ndjson" (una sesión JSON por línea) o "ics" (iCalendar)
+    
+    RETORNA:
+    - NDJSON: {"fecha", "dia_semana", "semana", "ejercicios": [...]} por línea
+    - ICS: un evento de día completo por sesión
+    
+    CÓDIGOS HTTP:
+    - 200: Éxito (sin líneas/eventos si la rutina no tiene ejercicios)
+    - 404: Rutina no encontrada
+    - 400: "hasta" es anterior a "desde"
+    
+    LÓGICA:
+    1. Cargar la rutina y armar la plantilla semanal (una sola consulta)
+    2. Cerrar la sesión de BD (libera la conexión antes del streaming)
+    3. Generar las sesiones día por día con un generador
+    4. Serializar y enviar cada sesión sin acumular el calendario completo
+    """
+    rutina = obtener_rutina_por_id(db, rutina_id)
+    
+    if not rutina:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Rutina con ID {rutina_id} no encontrada"
+        )
+    
+    inicio = desde or date.today()
+    fin = inicio + timedelta(weeks=semanas)
+    if hasta is not None:
+        if hasta < inicio:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="La fecha 'hasta' no puede ser anterior a 'desde'"
+            )
+        fin = min(fin, hasta)
+    
+    # La plantilla se copia a diccionarios: el streaming no usa la sesión de BD
+    plantilla = crear_plantilla(rutina)
+    rutina_id, nombre = rutina.id, rutina.nombre
+    
+    # La dependencia cierra la sesión recién después de enviar toda la
+    # respuesta: cerrarla ya devuelve la conexión al pool y no la deja
+    # "idle in transaction" mientras un cliente lento descarga el calendario
+    db.close()
+    
+    sesiones = expandir_sesiones(plantilla, inicio, fin)
+    
+    if formato == FormatoCalendarioEnum.ICS:
+        return StreamingResponse(
+            a_icalendar(rutina_id, nombre, sesiones),
+            media_type="text/calendar; charset=utf-8",
+            headers={"Content-Disposition": f'attachment; filename="rutina-{rutina_id}.ics"'}
+        )
+    return StreamingResponse(a_ndjson(sesiones), media_type="application/x-ndjson")
+
+
+# ============================================================================
+# HISTORIAL DE REVISIONES
+# ============================================================================
+
+def _verificar_rutina(db: Session, rutina_id: int):
+    """Lanza 404 si la rutina no existe"""
+    if obtener_rutina_por_id(db, rutina_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Rutina con ID {rutina_id} no encontrada"
+        )
+
+
+def _reconstruir_o_404(db: Session, rutina_id: int, numero: int):
+    """Reconstruye la revisión o lanza 404 si no existe"""
+    estado, revision = reconstruir(db, rutina_id, numero)
+    if estado is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Revisión {numero} de la rutina {rutina_id} no encontrada"
+        )
+    return estado, revision
+
+
+@router.get("/{rutina_id}/revisiones", response_model=List[RevisionResponse])
+def listar_revisiones_rutina(rutina_id: int, db: Session = Depends(get_db_lectura)):
+    """
+    OPERACIÓN: LISTAR REVISIONES DE UNA RUTINA
+    
+    MÉTODO HTTP: GET /api/rutinas/{rutina_id}/revisiones
+    
+    DESCRIPCIÓN:
+    Lista el historial de versiones de la rutina (sin el contenido).
+    Cada actualización genera una revisión; la revisión 1 es la creación.
+    
+    RETORNA:
+    - Lista de revisiones: número, fecha, si es snapshot y bytes guardados
+    
+    CÓDIGOS HTTP:
+    - 200: Éxito
+    - 404: Rutina no encontrada
+    """
+    _verificar_rutina(db, rutina_id)
+    return [
+        {
+            "numero": r.numero,
+            "fecha": r.fecha,
+            "es_snapshot": r.es_snapshot,
+            "bytes_almacenados": len(r.datos.encode("utf-8"))
+        }
+        for r in listar_revisiones(db, rutina_id)
+    ]
+
+
+@router.get("/{rutina_id}/revisiones/{numero}", response_model=RutinaRevisionResponse)
+def obtener_revision(rutina_id: int, numero: int, db: Session = Depends(get_db_lectura)):
+    """
+    OPERACIÓN: OBTENER UNA RUTINA TAL COMO ESTABA EN LA REVISIÓN N
+    
+    MÉTODO HTTP: GET /api/rutinas/{rutina_id}/revisiones/{numero}
+    
+    DESCRIPCIÓN:
+    Reconstruye la rutina a partir del snapshot más cercano y los deltas
+    posteriores. Para restaurarla, enviar el resultado en PUT /api/rutinas/{id}.
+    
+    CÓDIGOS HTTP:
+    - 200: Éxito
+    - 404: Revisión no encontrada
+    """
+    estado, revision = _reconstruir_o_404(db, rutina_id, numero)
+    return {**estado, "numero": revision.numero, "fecha": revision.fecha}
+
+
+@router.get("/{rutina_id}/revisiones/{desde}/diff/{hasta}", response_model=DiffRevisionesResponse)
+def diff_revisiones(rutina_id: int, desde: int, hasta: int, db: Session = Depends(get_db_lectura)):
+    """
+    OPERACIÓN: COMPARAR DOS REVISIONES
+    
+    MÉTODO HTTP: GET /api/rutinas/{rutina_id}/revisiones/{desde}/diff/{hasta}
+    
+    DESCRIPCIÓN:
+    Retorna qué cambió de la revisión "desde" a la revisión "hasta", con el
+    mismo formato de delta que se guarda en el historial (ver revisiones.py).
+    
+    CÓDIGOS HTTP:
+    - 200: Éxito
+    - 404: Alguna de las revisiones no existe
+    """
+    estado_desde, _ = _reconstruir_o_404(db, rutina_id, desde)
+    estado_hasta, _ = _reconstruir_o_404(db, rutina_id, hasta)
+    return {
+        "desde": desde,
+        "hasta": hasta,
+        "cambios": calcular_delta(estado_desde, estado_hasta)
+    }
+
+
 # ============================================================================
 # NOTA IMPORTANTE: ENDPOINTS DE EJERCICIOS INDIVIDUALES ELIMINADOS
 # ============================================================================
@@ -24,6 +24,12 @@ class DiaSemanEnum(str, Enum):
     DOMINGO = "Domingo"
 
 
+class FormatoCalendarioEnum(str, Enum):
+    """Formatos de salida del calendario de una rutina"""
+    NDJSON = "ndjson"
+    ICS = "ics"
+
+
 class EjercicioBase(BaseModel):
     """
     ESQUEMA BASE: EjercicioBase
@@ -156,4 +162,99 @@ class RutinaDetailResponse(RutinaResponse):
     ejercicios: List[EjercicioResponse] = []
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class CambiosResponse(BaseModel):
+    """
+    ESQUEMA: CambiosResponse
+    Se devuelve al consultar los cambios desde un cursor
+    Si completo es True, el cliente debe reemplazar su copia local
+    """
+    cursor: int
+    completo: bool
+    rutinas: List[RutinaDetailResponse] = []
+    eliminadas: List[int] = []
+
+
+class RevisionResponse(BaseModel):
+    """
+    ESQUEMA: RevisionResponse
+    Se devuelve al listar el historial de una rutina (sin contenido)
+    """
+    numero: int
+    fecha: datetime
+    es_snapshot: bool
+    bytes_almacenados: int
+
+
+class RutinaRevisionResponse(RutinaBase):
+    """
+    ESQUEMA: RutinaRevisionResponse
+    Rutina reconstruida tal como estaba en una revisión
+    Los ejercicios no tienen ID (se recrean en cada edición)
+    """
+    numero: int
+    fecha: datetime
+    ejercicios: List[EjercicioBase] = []
+
+
+class DiffRevisionesResponse(BaseModel):
+    """
+    ESQUEMA: DiffRevisionesResponse
+    Cambios entre dos revisiones (formato de delta de revisiones.py)
+    """
+    desde: int
+    hasta: int
+    cambios: dict
+
+
+class PlanProgresionRequest(BaseModel):
+    """
+    ESQUEMA: PlanProgresionRequest
+    Parámetros del plan de sobrecarga progresiva
+    Si aplicar_semana tiene valor, esa semana se guarda en los ejercicios
+    """
+    rutina_ids: Optional[List[int]] = None  # None: todas las rutinas
+    semanas: int = Field(default=12, ge=1, le=52)
+    incremento_peso: float = Field(default=2.5, ge=0)  # kg por semana
+    incremento_series: float = Field(default=0, ge=0)  # 0.25 = una serie más cada 4 semanas
+    incremento_repeticiones: float = Field(default=1, ge=0)
+    cada_deload: int = Field(default=4, ge=0)  # 0: sin semanas de descarga
+    factor_deload: float = Field(default=0.6, gt=0, le=1)
+    tope_peso_factor: float = Field(default=1.5, ge=1)
+    tope_series: int = Field(default=6, gt=0)
+    tope_repeticiones: int = Field(default=15, gt=0)
+    aplicar_semana: Optional[int] = Field(default=None, ge=1)
+
+    @validator('aplicar_semana')
+    def semana_dentro_del_plan(cls, v, values):
+        """Validar que la semana a aplicar esté dentro del plan"""
+        if v is not None and 'semanas' in values and v > values['semanas']:
+            raise ValueError('aplicar_semana no puede ser mayor que semanas')
+        return v
+
+
+class ProyeccionEjercicioResponse(BaseModel):
+    """
+    ESQUEMA: ProyeccionEjercicioResponse
+    Valores de un ejercicio semana a semana (la posición 0 es la semana 1)
+    """
+    id: int
+    rutina_id: int
+    nombre: str
+    series: List[int]
+    repeticiones: List[int]
+    peso: List[Optional[float]]
+
+
+class PlanProgresionResponse(BaseModel):
+    """
+    ESQUEMA: PlanProgresionResponse
+    Plan de sobrecarga progresiva de todos los ejercicios pedidos
+    """
+    semanas: int
+    deload: List[int]  # Números de las semanas de descarga
+    aplicada: Optional[int] = None
+    ejercicios_modificados: int = 0
+    ejercicios: List[ProyeccionEjercicioResponse] = []
@@ -0,0 +1,122 @@
+"""
+MÓDULO: sentencias.py
+DESCRIPCIÓN: Sentencias SQL precompiladas de los caminos más usados
+RESPONSABILIDADES:
+- Definir una sola vez (a nivel de módulo) las sentencias de lectura y
+  escritura más frecuentes, con parámetros enlazados (bindparam)
+- Contar aciertos y fallos de la caché de sentencias compiladas
+
+POR QUÉ:
+db.query(...) construye un objeto nuevo en cada request y SQLAlchemy lo
+recorre completo para calcular su clave de caché. Una sentencia definida
+a nivel de módulo calcula su clave una sola vez (queda memorizada) y su
+forma compilada se reutiliza desde la caché del engine; cada request solo
+aporta los valores de los parámetros.
+"""
+
+from sqlalchemy import select, delete, bindparam, event
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.orm import Session
+import threading
+from app.database import engine
+from app.models import Rutina, Ejercicio
+
+# ============================================================================
+# SENTENCIAS
+# ============================================================================
+# Los ejercicios se cargan con JOIN automáticamente (lazy="joined" en el modelo)
+
+# Rutina (con ejercicios) por ID
+SELECT_RUTINA_POR_ID = select(Rutina).where(Rutina.id == bindparam("rutina_id"))
+
+# Lock de la fila de la rutina hasta el fin de la transacción
+# (SELECT ... FOR UPDATE; SQLite no lo soporta y ya serializa las escrituras)
+SELECT_BLOQUEAR_RUTINA = select(Rutina.id).where(Rutina.id == bindparam("rutina_id")).with_for_update()
+
+# ID de la rutina con un nombre dado (para validar nombres únicos)
+SELECT_ID_POR_NOMBRE = select(Rutina.id).where(Rutina.nombre == bindparam("nombre")).limit(1)
+
+# Rutinas (con ejercicios) cuyo nombre contiene el texto, más nuevas primero
+SELECT_RUTINAS_POR_NOMBRE = select(Rutina).where(
+    Rutina.nombre.ilike(bindparam("busqueda"))
+).order_by(Rutina.fecha_creacion.desc())
+
+# Todos los ejercicios de una rutina
+# synchronize_session="fetch": con un bindparam la sesión no puede evaluar el
+# WHERE en Python, así que usa RETURNING para quitar los ejercicios borrados
+# del identity map (si no, chocan con los nuevos que reutilizan el mismo ID)
+DELETE_EJERCICIOS_DE_RUTINA = delete(Ejercicio).where(
+    Ejercicio.rutina_id == bindparam("rutina_id")
+).execution_options(synchronize_session="fetch")
+
+
+def obtener_rutina_por_id(db: Session, rutina_id: int):
+    """Retorna la Rutina con sus ejercicios, o None si no existe"""
+    return db.execute(
+        SELECT_RUTINA_POR_ID, {"rutina_id": rutina_id}
+    ).unique().scalar_one_or_none()
+
+
+def bloquear_rutina(db: Session, rutina_id: int):
+    """
+    Bloquea la rutina para que dos ediciones concurrentes se ejecuten en orden
+
+    Se llama ANTES de obtener_rutina_por_id: en READ COMMITTED, la consulta
+    siguiente ya ve lo que confirmó la edición que tenía el lock (el FOR
+    UPDATE no se aplica sobre el JOIN con ejercicios, que es LEFT OUTER).
+    """
+    db.execute(SELECT_BLOQUEAR_RUTINA, {"rutina_id": rutina_id})
+
+
+def existe_nombre(db: Session, nombre: str) -> bool:
+    """Indica si ya hay una rutina con ese nombre"""
+    return db.execute(SELECT_ID_POR_NOMBRE, {"nombre": nombre}).first() is not None
+
+
+def buscar_por_nombre(db: Session, nombre: str):
+    """Retorna las rutinas cuyo nombre contiene el texto (sin distinguir mayúsculas)"""
+    return db.execute(
+        SELECT_RUTINAS_POR_NOMBRE, {"busqueda": f"%{nombre}%"}
+    ).unique().scalars().all()
+
+
+def eliminar_ejercicios(db: Session, rutina_id: int):
+    """Elimina todos los ejercicios de una rutina (sin hacer commit)"""
+    db.execute(DELETE_EJERCICIOS_DE_RUTINA, {"rutina_id": rutina_id})
+
+
+# ============================================================================
+# ESTADÍSTICAS DE LA CACHÉ DE SENTENCIAS COMPILADAS
+# ============================================================================
+
+# Contadores expuestos en /metricas
+estadisticas = {
+    "aciertos": 0,     # Sentencia compilada tomada de la caché
+    "fallos": 0,       # Sentencia compilada y guardada en la caché
+    "sin_cache": 0     # SQL textual o sentencias que no se pueden cachear
+}
+_bloqueo_estadisticas = threading.Lock()
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _contar_cache(conn, cursor, statement, parameters, context, executemany):
+    if context is None:
+        return
+    if context.cache_hit is CacheStats.CACHE_HIT:
+        clave = "aciertos"
+    elif context.cache_hit is CacheStats.CACHE_MISS:
+        clave = "fallos"
+    else:
+        clave = "sin_cache"
+    with _bloqueo_estadisticas:
+        estadisticas[clave] += 1
+
+
+def estadisticas_cache() -> dict:
+    """Contadores de la caché más su ocupación actual"""
+    cache = engine._compiled_cache
+    return {
+        **estadisticas,
+        "tamaño": len(cache) if cache is not None else 0,
+        "capacidad": cache.capacity if cache is not None else 0
+    }
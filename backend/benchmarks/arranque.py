@@ -0,0 +1,73 @@
+"""
+MÓDULO: benchmarks/arranque.py
+DESCRIPCIÓN: Benchmark del tiempo de arranque de la API
+RESPONSABILIDADES:
+- Medir el tiempo de importación y de startup en un proceso nuevo
+- Comparar el arranque completo con el arranque rápido
+
+USO (desde la carpeta backend/):
+    python -m benchmarks.arranque --repeticiones 5
+    DATABASE_URL=postgresql://... python -m benchmarks.arranque
+
+Sin DATABASE_URL se usa una base SQLite temporal.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Código que se ejecuta en cada proceso hijo (proceso nuevo = arranque en frío)
+PROCESO_HIJO = """
+import asyncio, json, time
+inicio = time.perf_counter()
+from app.main import app
+importado = time.perf_counter()
+asyncio.run(app.router.startup())
+iniciado = time.perf_counter()
+print(json.dumps({"importar": importado - inicio, "startup": iniciado - importado}))
+"""
+
+
+def medir(modo_rapido: bool, entorno: dict) -> dict:
+    """Arranca la aplicación en un proceso nuevo y retorna los tiempos"""
+    entorno = dict(entorno, ARRANQUE_RAPIDO="true" if modo_rapido else "false")
+    resultado = subprocess.run(
+        [sys.executable, "-c", PROCESO_HIJO],
+        env=entorno,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(resultado.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de arranque de la API")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    entorno = dict(os.environ, DB_ECHO="false")
+    if not entorno.get("DATABASE_URL"):
+        ruta = os.path.join(tempfile.mkdtemp(), "arranque.db")
+        entorno["DATABASE_URL"] = f"sqlite:///{ruta}"
+
+    # Primer arranque completo: crea las tablas y registra la versión
+    medir(False, entorno)
+
+    for nombre, rapido in (("completo", False), ("rapido", True)):
+        tiempos = [medir(rapido, entorno) for _ in range(args.repeticiones)]
+        importar = statistics.median(t["importar"] for t in tiempos)
+        startup = statistics.median(t["startup"] for t in tiempos)
+        print(
+            f"{nombre:>9}: importar {importar * 1000:8.1f} ms | "
+            f"startup {startup * 1000:8.1f} ms | "
+            f"total {(importar + startup) * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
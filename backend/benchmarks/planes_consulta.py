@@ -0,0 +1,400 @@
+"""
+MÓDULO: benchmarks/planes_consulta.py
+DESCRIPCIÓN: Verificación de regresiones en los planes de ejecución de las consultas
+RESPONSABILIDADES:
+- Sembrar un dataset grande (opcional)
+- Ejecutar los endpoints principales y capturar las consultas que emiten
+- Obtener el plan de cada consulta (EXPLAIN / EXPLAIN QUERY PLAN)
+- Compararlo con los planes guardados en benchmarks/planes/<dialecto>.json
+- Señalar escaneos completos sobre tablas grandes
+
+USO (desde la carpeta backend/):
+    # SQLite temporal con datos sembrados, compara con el snapshot
+    python -m benchmarks.planes_consulta
+
+    # Regenerar el snapshot después de revisar un cambio de plan intencional
+    python -m benchmarks.planes_consulta --actualizar
+
+    # Contra una base de staging (no siembra datos, no deja cambios)
+    python -m benchmarks.planes_consulta --database-url postgresql://...
+
+Los endpoints se ejecutan dentro de una transacción que se revierte apenas
+se capturan sus sentencias, así que no quedan datos modificados. Mientras
+corren toman los mismos locks que en producción (LOCK TABLE sobre
+cambios_rutinas, SELECT ... FOR UPDATE sobre la rutina) y, en PostgreSQL,
+consumen valores de las secuencias. Los EXPLAIN se ejecutan después, en
+otra transacción corta (de solo lectura en PostgreSQL).
+Retorna código de salida 1 si algún plan cambió o aparece un escaneo
+completo no permitido. Con la base temporal, además comprueba que borrar
+el índice de ejercicios.rutina_id se detecte como escaneo completo.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+
+# Rutinas sembradas por defecto y ejercicios por rutina
+RUTINAS_SEMBRADAS = 2000
+EJERCICIOS_POR_RUTINA = 5
+
+# Cantidad de filas a partir de la cual una tabla se considera grande
+UMBRAL_FILAS = 1000
+
+# Escaneos completos esperados: (endpoint, tabla)
+# - listar: retorna todas las rutinas
+# - buscar: ILIKE '%texto%' no puede usar un índice B-tree
+ESCANEOS_PERMITIDOS = {
+    ("listar", "rutinas"),
+    ("buscar", "rutinas"),
+}
+
+# Carpeta con los planes guardados (uno por dialecto)
+CARPETA_PLANES = os.path.join(os.path.dirname(__file__), "planes")
+
+
+def configurar_entorno(database_url: str):
+    """Configura el entorno antes de importar la aplicación"""
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("DB_ECHO", "false")
+
+
+def sembrar(engine, cantidad: int):
+    """
+    Inserta "cantidad" rutinas con EJERCICIOS_POR_RUTINA ejercicios cada una
+
+    Usa inserts masivos de SQLAlchemy Core (mucho más rápido que el ORM).
+    """
+    from app.models import Rutina, Ejercicio, DiaSemanEnum
+
+    dias = list(DiaSemanEnum)
+    with engine.begin() as conexion:
+        inicio = conexion.execute(
+            Rutina.__table__.select().with_only_columns(Rutina.id).order_by(Rutina.id.desc()).limit(1)
+        ).scalar() or 0
+        rutinas = [
+            {"id": inicio + i + 1, "nombre": f"Rutina sembrada {inicio + i + 1}", "descripcion": "Semilla"}
+            for i in range(cantidad)
+        ]
+        conexion.execute(Rutina.__table__.insert(), rutinas)
+        ejercicios = [
+            {
+                "rutina_id": r["id"],
+                "nombre": f"Ejercicio {j}",
+                "dia_semana": dias[j % len(dias)],
+                "series": 3,
+                "repeticiones": 10,
+                "peso": 20.0,
+                "orden": j
+            }
+            for r in rutinas
+            for j in range(EJERCICIOS_POR_RUTINA)
+        ]
+        conexion.execute(Ejercicio.__table__.insert(), ejercicios)
+
+    # Actualizar estadísticas para que el planificador use los datos reales
+    with engine.begin() as conexion:
+        conexion.exec_driver_sql("ANALYZE")
+
+
+def preparar_sqlite(engine):
+    """
+    Hace que pysqlite respete BEGIN/SAVEPOINT (receta de la documentación de SQLAlchemy)
+    Sin esto, la transacción externa no se puede revertir.
+    """
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "connect")
+    def _desactivar_begin_implicito(conexion_dbapi, registro):
+        conexion_dbapi.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emitir_begin(conexion):
+        conexion.exec_driver_sql("BEGIN")
+
+
+def capturar_consultas(engine) -> dict:
+    """
+    Ejecuta cada endpoint y captura las sentencias SQL que emite
+
+    RETORNA:
+    - Diccionario endpoint -> lista de (sql, parámetros, plan)
+      La transacción de los endpoints se revierte antes de pedir los
+      planes, para no retener sus locks durante los EXPLAIN.
+    """
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+    from app.models import Rutina
+    from app.schemas import RutinaUpdate, PlanProgresionRequest
+    from app.routers.rutinas import (
+        listar_rutinas,
+        obtener_rutina,
+        buscar_rutinas,
+        actualizar_rutina,
+        planificar_progresion,
+        eliminar_rutina
+    )
+
+    conexion = engine.connect()
+    transaccion = conexion.begin()
+    db = Session(bind=conexion, join_transaction_mode="create_savepoint")
+
+    capturadas = []
+
+    def _capturar(conn, cursor, sql, parametros, contexto, executemany):
+        if not executemany and re.match(r"\s*(SELECT|UPDATE|DELETE)\b", sql, re.IGNORECASE):
+            capturadas.append((sql, parametros))
+
+    try:
+        rutina = db.query(Rutina).order_by(Rutina.id.asc()).first()
+        if rutina is None:
+            raise SystemExit("La base no tiene rutinas: usar --sembrar N")
+        rutina_id, nombre = rutina.id, rutina.nombre
+        ejercicios = [
+            {
+                "nombre": e.nombre,
+                "dia_semana": e.dia_semana.value,
+                "series": e.series,
+                "repeticiones": e.repeticiones,
+                "peso": e.peso,
+                "orden": e.orden
+            }
+            for e in rutina.ejercicios
+        ]
+        db.expunge_all()
+
+        endpoints = {
+            "listar": lambda: listar_rutinas(db=db),
+            "detalle": lambda: obtener_rutina(rutina_id, db=db),
+            "buscar": lambda: buscar_rutinas(nombre[:6], db=db),
+            "actualizar": lambda: actualizar_rutina(
+                rutina_id,
+                RutinaUpdate(nombre=f"{nombre} (plan)", ejercicios=ejercicios),
+                db=db
+            ),
+            "progresion": lambda: planificar_progresion(
+                PlanProgresionRequest(rutina_ids=[rutina_id], semanas=4, aplicar_semana=2),
+                db=db
+            ),
+            "eliminar": lambda: eliminar_rutina(rutina_id, db=db),
+        }
+
+        sentencias = {}
+        event.listen(engine, "before_cursor_execute", _capturar)
+        try:
+            for nombre_endpoint, ejecutar in endpoints.items():
+                capturadas.clear()
+                ejecutar()
+                db.expunge_all()
+                sentencias[nombre_endpoint] = list(capturadas)
+        finally:
+            event.remove(engine, "before_cursor_execute", _capturar)
+    finally:
+        db.close()
+        transaccion.rollback()
+        conexion.close()
+
+    with engine.connect() as conexion:
+        if conexion.dialect.name == "postgresql":
+            conexion.exec_driver_sql("SET TRANSACTION READ ONLY")
+        resultado = {
+            nombre_endpoint: [(sql, parametros, explicar(conexion, sql, parametros)) for sql, parametros in lista]
+            for nombre_endpoint, lista in sentencias.items()
+        }
+        conexion.rollback()
+    return resultado
+
+
+def explicar(conexion, sql: str, parametros) -> list:
+    """
+    Obtiene el plan de una sentencia, normalizado a una lista de líneas
+
+    - SQLite: columna "detail" de EXPLAIN QUERY PLAN
+    - PostgreSQL: nodos de EXPLAIN (FORMAT JSON), sin costos ni filas
+      estimadas (cambian con los datos y generarían falsos positivos)
+    """
+    if conexion.dialect.name == "sqlite":
+        filas = conexion.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", parametros).fetchall()
+        return [fila[-1] for fila in filas]
+
+    plan = conexion.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}", parametros).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    lineas = []
+
+    def _recorrer(nodo, nivel):
+        linea = "  " * nivel + nodo["Node Type"]
+        if "Relation Name" in nodo:
+            linea += f" on {nodo['Relation Name']}"
+        if "Index Name" in nodo:
+            linea += f" using {nodo['Index Name']}"
+        lineas.append(linea)
+        for hijo in nodo.get("Plans", []):
+            _recorrer(hijo, nivel + 1)
+
+    _recorrer(plan[0]["Plan"], 0)
+    return lineas
+
+
+def tablas_escaneadas(plan: list, sql: str = "") -> set:
+    """
+    Retorna las tablas que el plan recorre completas
+
+    SQLite nombra la tabla por su alias en la consulta (por ejemplo
+    "SCAN ejercicios_1" en el JOIN de lazy="joined"): los alias se
+    traducen al nombre real con los "tabla AS alias" del SQL.
+    """
+    alias = {a: tabla for tabla, a in re.findall(r"\b(\w+) AS (\w+)", sql)}
+    tablas = set()
+    for linea in plan:
+        # SQLite: "SCAN rutinas" o "SCAN rutinas USING INDEX ..." (índice completo)
+        coincidencia = re.match(r"\s*SCAN (\w+)", linea)
+        # PostgreSQL: "Seq Scan on rutinas" (siempre el nombre real)
+        coincidencia = coincidencia or re.match(r"\s*Seq Scan on (\w+)", linea)
+        if coincidencia:
+            tablas.add(alias.get(coincidencia.group(1), coincidencia.group(1)))
+    return tablas
+
+
+def comprobar_deteccion(engine, consultas: dict, filas: dict, umbral_filas: int) -> bool:
+    """
+    Verifica que la herramienta detecte la pérdida de un índice
+
+    Dentro de una transacción que se revierte (SQLite permite revertir DDL),
+    borra el índice de ejercicios.rutina_id y comprueba que la consulta de
+    detalle (JOIN con alias ejercicios_1) se reporte como escaneo completo.
+
+    RETORNA:
+    - True si el escaneo se detectó
+    """
+    sql, parametros, _plan = consultas["detalle"][0]
+    if filas.get("ejercicios", 0) < umbral_filas:
+        return True
+    # Conexión nueva: pysqlite reutiliza la sentencia EXPLAIN ya preparada
+    # en las conexiones del pool, y esa conserva el plan con el índice
+    engine.dispose()
+    conexion = engine.connect()
+    transaccion = conexion.begin()
+    try:
+        conexion.exec_driver_sql("DROP INDEX ix_ejercicios_rutina_id")
+        detectado = "ejercicios" in tablas_escaneadas(explicar(conexion, sql, parametros), sql)
+    finally:
+        transaccion.rollback()
+        conexion.close()
+    if detectado:
+        print("✓ comprobación: sin ix_ejercicios_rutina_id, detalle se reporta como escaneo completo")
+    else:
+        print("✗ comprobación: se borró ix_ejercicios_rutina_id y el escaneo de detalle no se detectó")
+    return detectado
+
+
+def contar_filas(engine) -> dict:
+    """Cantidad de filas de cada tabla del modelo"""
+    from sqlalchemy import func, select
+    from app.database import Base
+
+    with engine.connect() as conexion:
+        return {
+            tabla.name: conexion.execute(select(func.count()).select_from(tabla)).scalar()
+            for tabla in Base.metadata.sorted_tables
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regresiones en planes de consulta")
+    parser.add_argument("--database-url", help="Base a analizar (por defecto: SQLite temporal)")
+    parser.add_argument("--sembrar", type=int, default=None,
+                        help=f"Rutinas a sembrar (por defecto {RUTINAS_SEMBRADAS} en SQLite temporal, 0 con --database-url)")
+    parser.add_argument("--umbral-filas", type=int, default=UMBRAL_FILAS)
+    parser.add_argument("--actualizar", action="store_true", help="Reescribir el snapshot con los planes actuales")
+    args = parser.parse_args()
+
+    temporal = args.database_url is None
+    if temporal:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'planes.db')}"
+    else:
+        database_url = args.database_url
+    cantidad = args.sembrar if args.sembrar is not None else (RUTINAS_SEMBRADAS if temporal else 0)
+
+    configurar_entorno(database_url)
+    from app.database import engine
+    from app.arranque import crear_esquema
+
+    if temporal:
+        crear_esquema()
+    if cantidad:
+        sembrar(engine, cantidad)
+    if engine.dialect.name == "sqlite":
+        preparar_sqlite(engine)
+
+    filas = contar_filas(engine)
+    consultas = capturar_consultas(engine)
+
+    ruta_snapshot = os.path.join(CARPETA_PLANES, f"{engine.dialect.name}.json")
+    actual = {
+        f"{endpoint}#{i}": {"sql": " ".join(sql.split()), "plan": plan}
+        for endpoint, lista in consultas.items()
+        for i, (sql, _parametros, plan) in enumerate(lista)
+    }
+
+    if args.actualizar:
+        os.makedirs(CARPETA_PLANES, exist_ok=True)
+        with open(ruta_snapshot, "w", encoding="utf-8") as archivo:
+            json.dump(actual, archivo, indent=2, ensure_ascii=False)
+            archivo.write("\n")
+        print(f"✓ Snapshot actualizado: {ruta_snapshot} ({len(actual)} consultas)")
+        return 0
+
+    guardado = {}
+    if os.path.exists(ruta_snapshot):
+        with open(ruta_snapshot, encoding="utf-8") as archivo:
+            guardado = json.load(archivo)
+    else:
+        print(f"✗ No existe el snapshot {ruta_snapshot}: ejecutar con --actualizar")
+
+    problemas = 0
+    for clave, consulta in actual.items():
+        endpoint = clave.split("#")[0]
+        escaneos = {
+            tabla for tabla in tablas_escaneadas(consulta["plan"], consulta["sql"])
+            if filas.get(tabla, 0) >= args.umbral_filas
+            and (endpoint, tabla) not in ESCANEOS_PERMITIDOS
+        }
+        anterior = guardado.get(clave)
+
+        if anterior is None or anterior["plan"] != consulta["plan"] or escaneos:
+            problemas += 1
+            print(f"✗ {clave}: {consulta['sql']}")
+            if escaneos:
+                print(f"    escaneo completo en tabla grande: {', '.join(sorted(escaneos))}")
+            if anterior is None:
+                print("    consulta nueva (sin plan guardado)")
+            elif anterior["plan"] != consulta["plan"]:
+                print("    plan guardado:")
+                for linea in anterior["plan"]:
+                    print(f"      {linea}")
+                print("    plan actual:")
+                for linea in consulta["plan"]:
+                    print(f"      {linea}")
+        else:
+            print(f"✓ {clave}")
+
+    for clave in guardado.keys() - actual.keys():
+        problemas += 1
+        print(f"✗ {clave}: la consulta ya no se emite (revisar y usar --actualizar)")
+
+    # La base temporal es desechable: se puede borrar un índice para probar
+    # que el chequeo de escaneos completos funciona
+    if temporal and engine.dialect.name == "sqlite":
+        if not comprobar_deteccion(engine, consultas, filas, args.umbral_filas):
+            problemas += 1
+
+    print(f"\n{len(actual)} consultas, {problemas} con problemas")
+    return 1 if problemas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+MÓDULO: benchmarks/planificador.py
+DESCRIPCIÓN: Benchmark del planificador de sobrecarga progresiva
+RESPONSABILIDADES:
+- Generar ejercicios sintéticos (por defecto 10.000 rutinas x 5 ejercicios)
+- Comparar la proyección vectorizada de app/planificador.py con un bucle
+  de Python que recorre ejercicio por ejercicio y semana por semana
+- Verificar que ambas den exactamente el mismo resultado, que ningún
+  peso proyectado sea 0 o supere el tope (incluye pesos menores a 0.5 kg
+  y semanas de descarga) y que las semanas normales no bajen del peso inicial
+
+Solo mide el cálculo: no usa base de datos.
+
+USO (desde la carpeta backend/):
+    python -m benchmarks.planificador --rutinas 10000 --semanas 12
+"""
+
+import argparse
+import math
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("DB_ECHO", "false")
+
+import numpy as np  # noqa: E402
+from app.planificador import proyectar, REDONDEO_PESO  # noqa: E402
+
+# Parámetros del plan (los mismos valores por defecto del endpoint)
+PARAMETROS = {
+    "incremento_peso": 2.5,
+    "incremento_series": 0.25,
+    "incremento_repeticiones": 1,
+    "cada_deload": 4,
+    "factor_deload": 0.6,
+    "tope_peso_factor": 1.5,
+    "tope_series": 6,
+    "tope_repeticiones": 15
+}
+
+
+def generar_columnas(rutinas: int, ejercicios_por_rutina: int, semilla: int = 0) -> dict:
+    """Ejercicios aleatorios con el mismo formato que cargar_columnas"""
+    generador = np.random.default_rng(semilla)
+    total = rutinas * ejercicios_por_rutina
+    peso = generador.integers(10, 200, total) * 0.5
+    livianos = generador.random(total) < 0.05  # 5% por debajo de REDONDEO_PESO
+    peso[livianos] = generador.choice([0.1, 0.2, 0.25, 0.4], livianos.sum())
+    desalineados = generador.random(total) < 0.05  # 5% fuera de la grilla de 0.5 kg (ej. 62.3)
+    peso[desalineados] += 0.3
+    peso[generador.random(total) < 0.2] = np.nan  # 20% peso corporal
+    return {
+        "id": np.arange(1, total + 1),
+        "rutina_id": np.repeat(np.arange(1, rutinas + 1), ejercicios_por_rutina),
+        "nombre": [f"Ejercicio {i}" for i in range(total)],
+        "series": generador.integers(2, 6, total),
+        "repeticiones": generador.integers(5, 16, total),
+        "peso": peso
+    }
+
+
+def proyectar_bucle(filas: list, semanas: int, p: dict) -> list:
+    """
+    Versión ingenua: un ejercicio a la vez, una semana a la vez
+
+    RETORNA:
+    - Por ejercicio, (series, repeticiones, peso) como listas por semana
+    """
+    resultado = []
+    for series0, repeticiones0, peso0 in filas:
+        series_semana, repeticiones_semana, peso_semana = [], [], []
+        pasos = 0
+        for semana in range(1, semanas + 1):
+            deload = p["cada_deload"] > 0 and semana % p["cada_deload"] == 0
+            series = min(series0 + math.floor(pasos * p["incremento_series"]), max(p["tope_series"], series0))
+            repeticiones = min(
+                repeticiones0 + math.floor(pasos * p["incremento_repeticiones"]),
+                max(p["tope_repeticiones"], repeticiones0)
+            )
+            peso = None
+            if peso0 is not None:
+                peso = min(peso0 + pasos * p["incremento_peso"], peso0 * p["tope_peso_factor"])
+            if deload:
+                series = max(1, math.floor(series * p["factor_deload"]))
+                if peso is not None:
+                    peso = peso * p["factor_deload"]
+            if peso is not None and (pasos > 0 or deload):
+                peso = math.floor(peso / REDONDEO_PESO + 1e-9) * REDONDEO_PESO
+                peso = max(peso, min(peso0, REDONDEO_PESO) if deload else peso0)
+            series_semana.append(series)
+            repeticiones_semana.append(repeticiones)
+            peso_semana.append(peso)
+            if not deload:
+                pasos += 1
+        resultado.append((series_semana, repeticiones_semana, peso_semana))
+    return resultado
+
+
+def verificar_limites(columnas: dict, plan: dict, parametros: dict):
+    """
+    Todos los pesos proyectados son positivos y respetan el tope, también
+    en las semanas de descarga y para ejercicios más livianos que REDONDEO_PESO.
+    En las semanas normales ningún peso queda por debajo del inicial.
+    """
+    peso0 = columnas["peso"][None, :]
+    con_peso = ~np.isnan(np.broadcast_to(peso0, plan["peso"].shape))
+    peso = plan["peso"][con_peso]
+    inicial = np.broadcast_to(peso0, plan["peso"].shape)[con_peso]
+    tope = inicial * parametros["tope_peso_factor"]
+    normal = np.broadcast_to(~plan["deload"][:, None], plan["peso"].shape)[con_peso]
+    if (peso <= 0).any():
+        raise SystemExit(f"ERROR: {(peso <= 0).sum()} pesos proyectados <= 0")
+    if (peso > tope + 1e-9).any():
+        raise SystemExit(f"ERROR: {(peso > tope + 1e-9).sum()} pesos proyectados por encima del tope")
+    if (peso[normal] < inicial[normal]).any():
+        raise SystemExit(f"ERROR: {(peso[normal] < inicial[normal]).sum()} pesos de semanas normales por debajo del inicial")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del planificador de sobrecarga progresiva")
+    parser.add_argument("--rutinas", type=int, default=10000)
+    parser.add_argument("--ejercicios", type=int, default=5, help="Ejercicios por rutina")
+    parser.add_argument("--semanas", type=int, default=12)
+    parser.add_argument("--repeticiones", type=int, default=5, help="Mediciones (se toma la mejor)")
+    args = parser.parse_args()
+
+    columnas = generar_columnas(args.rutinas, args.ejercicios)
+    filas = [
+        (int(s), int(r), None if math.isnan(p) else float(p))
+        for s, r, p in zip(columnas["series"], columnas["repeticiones"], columnas["peso"])
+    ]
+
+    def medir(funcion):
+        mejor = math.inf
+        for _ in range(args.repeticiones):
+            inicio = time.perf_counter()
+            resultado = funcion()
+            mejor = min(mejor, time.perf_counter() - inicio)
+        return resultado, mejor * 1000
+
+    plan, t_vectorizado = medir(lambda: proyectar(columnas, args.semanas, **PARAMETROS))
+    esperado, t_bucle = medir(lambda: proyectar_bucle(filas, args.semanas, PARAMETROS))
+
+    # Mismo resultado, ejercicio por ejercicio
+    peso = np.where(np.isnan(plan["peso"]), None, plan["peso"]).T.tolist()
+    obtenido = list(zip(plan["series"].T.tolist(), plan["repeticiones"].T.tolist(), peso))
+    if obtenido != [tuple(e) for e in esperado]:
+        raise SystemExit("ERROR: la proyección vectorizada no coincide con el bucle")
+    verificar_limites(columnas, plan, PARAMETROS)
+
+    celdas = len(filas) * args.semanas
+    print(f"{len(filas)} ejercicios x {args.semanas} semanas = {celdas} celdas")
+    print(f"{'implementación':<14} {'ms':>10}")
+    print(f"{'bucle':<14} {t_bucle:10.1f}")
+    print(f"{'vectorizada':<14} {t_vectorizado:10.1f}")
+    print(f"mejora: {t_bucle / t_vectorizado:.1f}x (resultados idénticos, pesos > 0, dentro del tope y sin bajar del inicial)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+MÓDULO: benchmarks/sentencias.py
+DESCRIPCIÓN: Microbenchmark del costo en Python de las consultas más usadas
+RESPONSABILIDADES:
+- Comparar db.query(...) construido en cada request (antes) con las
+  sentencias precompiladas de app/sentencias.py (después)
+- Aislar el costo de Python: la base de datos está simulada
+
+CÓMO SE SIMULA LA BASE DE DATOS:
+La conexión DBAPI es un "grabador": la primera vez que ve una sentencia
+(SQL + parámetros) la ejecuta en un SQLite en memoria y guarda el
+resultado; las siguientes veces lo devuelve sin tocar ninguna base. Así
+cada iteración medida solo incluye construcción de la sentencia, caché
+de compilación, ejecución del ORM y armado de objetos.
+
+USO (desde la carpeta backend/):
+    python -m benchmarks.sentencias --iteraciones 5000
+"""
+
+import argparse
+import os
+import sqlite3
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("DB_ECHO", "false")
+
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from app.database import Base  # noqa: E402
+from app.models import Rutina, Ejercicio, DiaSemanEnum  # noqa: E402
+from app import sentencias  # noqa: E402
+
+# Resultados grabados: (sql, parámetros) -> (description, filas, rowcount, lastrowid)
+grabaciones = {}
+
+
+class CursorGrabado:
+    """Cursor DBAPI que reproduce resultados grabados"""
+
+    def __init__(self, conexion):
+        self.conexion = conexion
+        self.description = None
+        self.rowcount = -1
+        self.lastrowid = None
+        self._filas = []
+
+    def execute(self, sql, parametros=()):
+        clave = (sql, tuple(parametros))
+        if clave not in grabaciones:
+            cursor = self.conexion.real.cursor()
+            cursor.execute(sql, parametros)
+            filas = cursor.fetchall() if cursor.description else []
+            grabaciones[clave] = (cursor.description, filas, cursor.rowcount, cursor.lastrowid)
+            # Durante la medición las escrituras no se aplican: todas las
+            # variantes ven los mismos datos
+            if not self.conexion.persistir:
+                self.conexion.real.rollback()
+        self.description, filas, self.rowcount, self.lastrowid = grabaciones[clave]
+        self._filas = list(filas)
+
+    def executemany(self, sql, lista_parametros):
+        for parametros in lista_parametros:
+            self.execute(sql, parametros)
+
+    def fetchone(self):
+        return self._filas.pop(0) if self._filas else None
+
+    def fetchmany(self, cantidad=1):
+        filas, self._filas = self._filas[:cantidad], self._filas[cantidad:]
+        return filas
+
+    def fetchall(self):
+        filas, self._filas = self._filas, []
+        return filas
+
+    def close(self):
+        pass
+
+
+class ConexionGrabada:
+    """Conexión DBAPI que delega en un SQLite en memoria solo la primera vez"""
+
+    def __init__(self):
+        self.real = sqlite3.connect(":memory:", check_same_thread=False)
+        self.persistir = True  # True mientras se crean las tablas y los datos
+        self.isolation_level = None
+
+    def cursor(self):
+        return CursorGrabado(self)
+
+    def commit(self):
+        if self.persistir:
+            self.real.commit()
+
+    def rollback(self):
+        if self.persistir:
+            self.real.rollback()
+
+    def create_function(self, *args, **kwargs):
+        self.real.create_function(*args, **kwargs)
+
+    def close(self):
+        pass
+
+
+# ============================================================================
+# CONSULTAS: ANTES (db.query en cada request) Y DESPUÉS (precompiladas)
+# ============================================================================
+
+def antes_obtener(db, rutina_id):
+    return db.query(Rutina).filter(Rutina.id == rutina_id).first()
+
+
+def despues_obtener(db, rutina_id):
+    return sentencias.obtener_rutina_por_id(db, rutina_id)
+
+
+def antes_buscar(db, nombre):
+    return db.query(Rutina).filter(
+        Rutina.nombre.ilike(f"%{nombre}%")
+    ).order_by(Rutina.fecha_creacion.desc()).all()
+
+
+def despues_buscar(db, nombre):
+    return sentencias.buscar_por_nombre(db, nombre)
+
+
+def antes_actualizar(db, rutina_id, nombre):
+    """Consultas de actualizar_rutina previas al flush"""
+    db.query(Rutina).filter(Rutina.id == rutina_id).first()
+    db.query(Rutina).filter(Rutina.nombre == nombre).first()
+    db.query(Ejercicio).filter(Ejercicio.rutina_id == rutina_id).delete()
+
+
+def despues_actualizar(db, rutina_id, nombre):
+    sentencias.obtener_rutina_por_id(db, rutina_id)
+    sentencias.existe_nombre(db, nombre)
+    sentencias.eliminar_ejercicios(db, rutina_id)
+
+
+def medir(engine, operacion, iteraciones: int, *args) -> float:
+    """Microsegundos promedio por llamada (sesión nueva en cada una, como un request)"""
+    for _ in range(10):  # Calentamiento: graba resultados y llena la caché
+        with Session(engine) as db:
+            operacion(db, *args)
+    inicio = time.perf_counter()
+    for _ in range(iteraciones):
+        with Session(engine) as db:
+            operacion(db, *args)
+    return (time.perf_counter() - inicio) / iteraciones * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark de sentencias precompiladas")
+    parser.add_argument("--iteraciones", type=int, default=5000)
+    args = parser.parse_args()
+
+    conexion = ConexionGrabada()
+    engine = create_engine("sqlite://", creator=lambda: conexion)
+    event.listen(engine, "before_cursor_execute", sentencias._contar_cache)
+
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        rutina = Rutina(nombre="Rutina de prueba", descripcion="Benchmark")
+        for i in range(5):
+            rutina.ejercicios.append(Ejercicio(
+                nombre=f"Ejercicio {i}",
+                dia_semana=list(DiaSemanEnum)[i],
+                series=4,
+                repeticiones=10,
+                peso=50.0,
+                orden=i
+            ))
+        db.add(rutina)
+        db.commit()
+        rutina_id = rutina.id
+    conexion.persistir = False
+
+    casos = [
+        ("obtener_rutina", antes_obtener, despues_obtener, (rutina_id,)),
+        ("buscar_rutinas", antes_buscar, despues_buscar, ("prueba",)),
+        ("actualizar_rutina", antes_actualizar, despues_actualizar, (rutina_id, "Otro nombre")),
+    ]
+
+    print(f"{'endpoint':<18} {'antes (µs)':>12} {'después (µs)':>14} {'mejora':>8}")
+    for nombre, antes, despues, parametros in casos:
+        t_antes = medir(engine, antes, args.iteraciones, *parametros)
+        t_despues = medir(engine, despues, args.iteraciones, *parametros)
+        print(f"{nombre:<18} {t_antes:12.1f} {t_despues:14.1f} {t_antes / t_despues:7.2f}x")
+
+    print(f"\nCaché de sentencias compiladas: {sentencias.estadisticas}")
+
+
+if __name__ == "__main__":
+    main()
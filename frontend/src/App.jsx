@@ -14,7 +14,7 @@ import RutinasList from './components/RutinasList';
 import RutinaForm from './components/RutinaForm';
 import RutinaDetail from './components/RutinaDetail';
 import SearchBar from './components/SearchBar';
-import { getRutinas, buscarRutinas } from './api';
+import { sincronizarRutinas, buscarRutinas, cancelarBusqueda } from './api';
 
 function App() {
   // =========================================================================
@@ -56,14 +56,14 @@ function App() {
    * FUNCIÓN: cargarRutinas
    * 
    * RESPONSABILIDADES:
-   * - Obtener todas las rutinas del backend
+   * - Sincronizar las rutinas con el backend (solo descarga los cambios)
    * - Manejar estados de carga y error
    */
   async function cargarRutinas() {
     try {
       setCargando(true);
       setError(null);
-      const data = await getRutinas();
+      const data = await sincronizarRutinas();
       setRutinas(data);
       setResultadosBusqueda(null); // Limpiar búsqueda
     } catch (err) {
@@ -80,6 +80,7 @@ function App() {
    * RESPONSABILIDADES:
    * - Buscar rutinas por nombre
    * - Si está vacío, mostrar todas las rutinas
+   * - Ignorar búsquedas abortadas (reemplazadas por una más nueva)
    * - Manejar errores de búsqueda
    * 
    * PARÁMETROS:
@@ -89,12 +90,16 @@ function App() {
     try {
       setError(null);
       if (!texto.trim()) {
+        cancelarBusqueda();
         setResultadosBusqueda(null);
         return;
       }
       const resultados = await buscarRutinas(texto);
       setResultadosBusqueda(resultados);
     } catch (err) {
+      if (err.name === 'AbortError') {
+        return;
+      }
       setError(`Error en búsqueda: ${err.message}`);
       setResultadosBusqueda([]);
     }
@@ -61,6 +61,79 @@ export async function getRutinas() {
   return handleResponse(response);
 }
 
+// ============================================================================
+// SINCRONIZACIÓN INCREMENTAL DE RUTINAS
+// ============================================================================
+// Se mantiene una copia local de las rutinas y el último cursor recibido.
+// Cada sincronización solo descarga lo que cambió desde ese cursor, así el
+// costo depende de la cantidad de cambios y no del total de rutinas.
+
+// Copia local: id -> Rutina completa (con ejercicios)
+const rutinasLocales = new Map();
+
+// Último cursor recibido del log de cambios (0 = nunca se sincronizó)
+let cursorCambios = 0;
+
+/**
+ * FUNCIÓN AUXILIAR: ordenarRutinas
+ * 
+ * RESPONSABILIDADES:
+ * - Retornar la copia local como array, en el mismo orden que GET /api/rutinas
+ */
+function ordenarRutinas() {
+  return Array.from(rutinasLocales.values()).sort(
+    (a, b) => a.fecha_creacion.localeCompare(b.fecha_creacion) || a.id - b.id
+  );
+}
+
+/**
+ * OPERACIÓN: Obtener los cambios desde un cursor
+ * 
+ * MÉTODO: GET /api/rutinas/cambios?desde={cursor}&espera={segundos}
+ * 
+ * PARÁMETROS:
+ * - desde: Último cursor recibido
+ * - espera: Segundos que el servidor espera un cambio (long-polling)
+ * 
+ * RETORNA:
+ * - Objeto { cursor, completo, rutinas, eliminadas }
+ */
+export async function getCambios(desde, espera = 0) {
+  const params = new URLSearchParams({ desde, espera });
+  const response = await fetch(`${API_BASE_URL}/rutinas/cambios?${params}`);
+  return handleResponse(response);
+}
+
+/**
+ * OPERACIÓN: Sincronizar la copia local de rutinas
+ * 
+ * RESPONSABILIDADES:
+ * - Pedir solo los cambios desde el último cursor
+ * - Aplicar el delta (o reemplazar todo si el servidor envía la lista completa)
+ * 
+ * PARÁMETROS:
+ * - espera: Segundos de long-polling (0 = responder de inmediato)
+ * 
+ * RETORNA:
+ * - Array de Rutinas actualizado (mismo formato que getRutinas)
+ */
+export async function sincronizarRutinas(espera = 0) {
+  const cambios = await getCambios(cursorCambios, espera);
+
+  if (cambios.completo) {
+    rutinasLocales.clear();
+  }
+  for (const rutina of cambios.rutinas) {
+    rutinasLocales.set(rutina.id, rutina);
+  }
+  for (const id of cambios.eliminadas) {
+    rutinasLocales.delete(id);
+  }
+  cursorCambios = cambios.cursor;
+
+  return ordenarRutinas();
+}
+
 /**
  * OPERACIÓN: Obtener una rutina específica con todos sus ejercicios
  * 
@@ -81,6 +154,42 @@ export async function getRutina(id) {
   return handleResponse(response);
 }
 
+// Espera (ms) desde la última tecla antes de enviar la búsqueda
+const ESPERA_BUSQUEDA_MS = 250;
+
+// Controlador de la búsqueda en curso (para abortarla si llega otra)
+let controladorBusqueda = null;
+
+/**
+ * OPERACIÓN: Cancelar la búsqueda en curso
+ * 
+ * RESPONSABILIDADES:
+ * - Abortar la búsqueda pendiente o en vuelo
+ * - Al abortar el fetch se cierra la conexión y el backend cancela la consulta
+ */
+export function cancelarBusqueda() {
+  if (controladorBusqueda) {
+    controladorBusqueda.abort();
+    controladorBusqueda = null;
+  }
+}
+
+/**
+ * FUNCIÓN AUXILIAR: esperar
+ * 
+ * RESPONSABILIDADES:
+ * - Esperar "ms" milisegundos, o rechazar con AbortError si se aborta la señal
+ */
+function esperar(ms, signal) {
+  return new Promise((resolve, reject) => {
+    const timer = setTimeout(resolve, ms);
+    signal.addEventListener('abort', () => {
+      clearTimeout(timer);
+      reject(new DOMException('Búsqueda reemplazada', 'AbortError'));
+    });
+  });
+}
+
 /**
  * OPERACIÓN: Buscar rutinas por nombre
  * 
@@ -89,17 +198,33 @@ export async function getRutina(id) {
  * RESPONSABILIDADES:
  * - Búsqueda parcial case-insensitive
  * - Retornar coincidencias en tiempo real
+ * - Debounce: solo se envía si no llega otra búsqueda en ESPERA_BUSQUEDA_MS
+ * - Abortar la búsqueda anterior (el backend cancela su consulta)
  * 
  * PARÁMETROS:
  * - nombre: Texto a buscar
  * 
  * RETORNA:
  * - Array de Rutinas que coinciden
+ * - Lanza AbortError si fue reemplazada por una búsqueda más nueva
  */
 export async function buscarRutinas(nombre) {
+  cancelarBusqueda();
+  const controlador = new AbortController();
+  controladorBusqueda = controlador;
+
+  await esperar(ESPERA_BUSQUEDA_MS, controlador.signal);
+
   const params = new URLSearchParams({ nombre });
-  const response = await fetch(`${API_BASE_URL}/rutinas/buscar/nombre?${params}`);
-  return handleResponse(response);
+  const response = await fetch(`${API_BASE_URL}/rutinas/buscar/nombre?${params}`, {
+    signal: controlador.signal,
+  });
+  const resultado = await handleResponse(response);
+
+  if (controladorBusqueda === controlador) {
+    controladorBusqueda = null;
+  }
+  return resultado;
 }
 
 /**